@@ -51,20 +51,30 @@ except ImportError:
         )
 
 # Server (optional dependency)
-try:
-    from .server import serve
-    _server_available = True
-except ImportError:
-    _server_available = False
-    
+# Imported lazily on first access to `chak.serve`, so `import chak` does not
+# pull in FastAPI/uvicorn for users who only need Conversation.
+def _serve_unavailable(*args, **kwargs):
     # Provide helpful error message when server dependencies are missing
-    def serve(*args, **kwargs):
-        raise ImportError(
-            "Server dependencies not installed. Install with:\n"
-            "  pip install chakpy[server]\n"
-            "or:\n"
-            "  pip install chakpy[all]"
-        )
+    raise ImportError(
+        "Server dependencies not installed. Install with:\n"
+        "  pip install chakpy[server]\n"
+        "or:\n"
+        "  pip install chakpy[all]"
+    )
+
+
+def __getattr__(name):
+    if name in ('serve', '_server_available'):
+        try:
+            from .server import serve
+            available = True
+        except ImportError:
+            serve = _serve_unavailable
+            available = False
+        globals()['serve'] = serve
+        globals()['_server_available'] = available
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Export the public API
@@ -91,7 +101,6 @@ __all__ = [
     'FIFOStrategy',
     'NoopStrategy',
     'SummarizationStrategy',
-    'NoopStrategy',
     'BaseContextStrategy',
     'StrategyRequest',
     'StrategyResponse',
@@ -1,28 +1,121 @@
 # chak/context/strategies/base.py
 """Base class for context management strategies."""
 
+import asyncio
+import os
 from abc import ABC, abstractmethod
-from typing import List, Callable, Optional
-
-from pydantic import BaseModel
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter, is_
+from typing import List, Callable, Optional, Tuple
 
 from ...message import Message
 
+# Texts longer than this bypass the string-level cache; their counts are
+# still memoized per message, and keeping them out bounds cache memory.
+_MAX_CACHED_TEXT_LEN = 4096
+
+# Message texts longer than this keep only head + tail in summarizer prompts
+_MAX_PROMPT_TEXT_CHARS = 4000
+
+# encode_ordinary_batch starts a fresh thread pool per call, so it is kept for bulk
+# priming (e.g. a restored history); the usual few new messages per turn are
+# encoded serially. Batches use at most _MAX_ENCODE_THREADS threads.
+_MIN_BATCH_ENCODE = 64
+_MAX_ENCODE_THREADS = 4
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(name: str = "cl100k_base"):
+    """Load a tiktoken encoding once per process."""
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+
+@lru_cache(maxsize=4096)
+def _count_cached(text: str) -> int:
+    """Count cl100k_base tokens, memoizing repeated strings (system prompts, tool outputs)."""
+    return _count_uncached(text)
+
+
+def _count_uncached(text: str) -> int:
+    # 允许特殊 token，避免编码错误
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+
+def _count_tiktoken(text: str) -> int:
+    if len(text) > _MAX_CACHED_TEXT_LEN:
+        return _count_uncached(text)
+    return _count_cached(text)
+
+
+def _count_estimated(text: str) -> int:
+    # Fallback: 1 token ≈ 4 characters
+    return len(text) >> 2
+
+
+@lru_cache(maxsize=None)
+def _resolve_default_counter() -> Callable[[str], int]:
+    """
+    Pick the default counter once: tiktoken if importable, else the estimate.
+    
+    Resolved lazily (not at import time) so importing chak never loads the
+    tiktoken vocabulary, but after the first call no counting pays for an
+    import attempt or a try/except.
+    """
+    try:
+        _get_encoding()
+    except ImportError:
+        return _count_estimated
+    return _count_tiktoken
+
+
+def _truncate_middle(text: str, max_chars: int = _MAX_PROMPT_TEXT_CHARS) -> str:
+    """Cut text longer than max_chars to its head and tail, noting how much was dropped."""
+    if len(text) <= max_chars:
+        return text
+    half = max_chars // 2
+    return f"{text[:half]}\n...[truncated {len(text) - 2 * half} chars]...\n{text[-half:]}"
+
+
+_get_content = attrgetter("content")
+
+
+def _snapshot_messages(messages: List[Message]) -> Tuple[tuple, tuple]:
+    """Record the messages and their contents for a later _prefix_unchanged() check."""
+    return tuple(messages), tuple(map(_get_content, messages))
 
-class StrategyRequest(BaseModel):
+
+def _prefix_unchanged(messages: List[Message], snapshot: Tuple[tuple, tuple]) -> bool:
+    """
+    Check that messages still starts with the snapshotted messages, unedited.
+    
+    Only identities are compared (a C-level pass, no tokenizing), so replacing,
+    removing or inserting an earlier message, or assigning its content, all
+    invalidate state built from the snapshot.
+    """
+    prefix, contents = snapshot
+    return (
+        len(messages) >= len(prefix)
+        and all(map(is_, messages, prefix))
+        and all(map(is_, map(_get_content, messages), contents))
+    )
+
+
+@dataclass
+class StrategyRequest:
     """Strategy 的请求"""
-    messages: List[Message]
+    __slots__ = ('messages',)
     
-    class Config:
-        arbitrary_types_allowed = True
+    messages: List[Message]
 
 
-class StrategyResponse(BaseModel):
+@dataclass
+class StrategyResponse:
     """Strategy 的响应"""
-    messages: List[Message]  # 完整消息列表（含策略插入的标记）
+    __slots__ = ('messages',)
     
-    class Config:
-        arbitrary_types_allowed = True
+    messages: List[Message]  # 完整消息列表（含策略插入的标记）
 
 
 class BaseContextStrategy(ABC):
@@ -48,7 +141,7 @@ class BaseContextStrategy(ABC):
                           If not provided, uses default counter
             **config: Strategy-specific configuration parameters
         """
-        self.token_counter = token_counter or self._default_token_counter
+        self.token_counter = token_counter or _resolve_default_counter()
         self.config = config
     
     @abstractmethod
@@ -70,6 +163,45 @@ class BaseContextStrategy(ABC):
         """
         pass
     
+    async def aprocess(self, request: StrategyRequest) -> StrategyResponse:
+        """
+        Async version of process().
+        
+        Runs process() in a worker thread so strategies that block (e.g. on a
+        summarizer LLM call) don't stall the event loop; many conversations
+        can then be processed concurrently.
+        
+        Args:
+            request: Strategy request containing messages
+            
+        Returns:
+            Strategy response with processed messages
+        """
+        return await asyncio.to_thread(self.process, request)
+    
+    def process_incremental(
+        self,
+        prev_response: StrategyResponse,
+        new_messages: List[Message]
+    ) -> StrategyResponse:
+        """
+        Process messages appended after a previous response.
+        
+        Equivalent to process() on prev_response.messages + new_messages.
+        Strategies that keep running state (e.g. FIFOStrategy) reuse it in
+        process() while the earlier messages are unchanged, so only
+        new_messages are analyzed.
+        
+        Args:
+            prev_response: Response returned by an earlier process() call
+            new_messages: Messages appended since then
+            
+        Returns:
+            Strategy response with processed messages
+        """
+        messages = prev_response.messages + list(new_messages)
+        return self.process(StrategyRequest(messages=messages))
+    
     def count_tokens(self, text: str) -> int:
         """
         Count tokens in a text string.
@@ -86,19 +218,123 @@ class BaseContextStrategy(ABC):
         """
         Count total tokens in a message list.
         
+        The list is only read, never mutated, so callers can pass their
+        own lists without copying.
+        
         Args:
             messages: List of messages
             
         Returns:
             Total token count (including format overhead)
         """
+        self._prime_token_cache(messages)
+        
         total = 0
         for msg in messages:
             total += 4  # Format overhead per message
-            total += self.count_tokens(msg.content or "")
+            total += self._content_tokens(msg)
         total += 2  # Conversation end marker
         return total
     
+    def _content_tokens(self, msg: Message) -> int:
+        """
+        Count tokens in a message's content, memoized on the message.
+        
+        The cached count is reused only while both the token counter and
+        the content object are unchanged, so each message is tokenized once
+        instead of on every process() call.
+        
+        Args:
+            msg: Message to count
+            
+        Returns:
+            Token count of the message content (without format overhead)
+        """
+        cached = msg._token_cache
+        if cached is not None and cached[0] is self.token_counter and cached[1] is msg.content:
+            return cached[2]
+        
+        count = self.count_tokens(msg.content)
+        msg._token_cache = (self.token_counter, msg.content, count)
+        return count
+    
+    @staticmethod
+    def _stripped_content(msg: Message) -> str:
+        """
+        Return msg.content.strip(), memoized on the message.
+        
+        Summarizers re-read the same history on every trigger; the cached
+        value is reused while the content object is unchanged.
+        
+        Args:
+            msg: Message whose content to strip
+            
+        Returns:
+            Stripped content
+        """
+        cached = msg._strip_cache
+        if cached is not None and cached[0] is msg.content:
+            return cached[1]
+        
+        stripped = msg.content.strip()
+        msg._strip_cache = (msg.content, stripped)
+        return stripped
+    
+    def _prime_token_cache(self, messages: List[Message]) -> None:
+        """
+        Batch-tokenize messages whose token counts are not cached yet.
+        
+        With the default tiktoken counter, at least _MIN_BATCH_ENCODE uncached
+        contents (e.g. on the first count after restoring a long history) are
+        encoded in one encode_ordinary_batch call on a small thread pool instead
+        of one Python -> C call per message. Fewer are left to _content_tokens,
+        as are custom counters.
+        
+        Args:
+            messages: Messages whose counts will be needed
+        """
+        counter = self.token_counter
+        if counter is not _count_tiktoken:
+            return
+        
+        pending = []
+        for msg in messages:
+            cached = msg._token_cache
+            if cached is None or cached[0] is not counter or cached[1] is not msg.content:
+                pending.append(msg)
+        if len(pending) < _MIN_BATCH_ENCODE:
+            return
+        
+        encoded = _get_encoding().encode_ordinary_batch(
+            [msg.content for msg in pending],
+            num_threads=min(_MAX_ENCODE_THREADS, os.cpu_count() or 1)
+        )
+        for msg, tokens in zip(pending, encoded):
+            msg._token_cache = (counter, msg.content, len(tokens))
+    
+    def _max_possible_tokens(self, messages: List[Message]) -> Optional[int]:
+        """
+        Cheap upper bound on count_messages_tokens(messages), without tokenizing.
+        
+        BPE never produces more tokens than UTF-8 bytes (and the character-based
+        fallback produces fewer), so byte length bounds the default counter.
+        Custom token counters have no known bound.
+        
+        Args:
+            messages: List of messages
+            
+        Returns:
+            Upper bound on the token count, or None if a custom counter is used
+        """
+        if self.token_counter not in (_count_tiktoken, _count_estimated):
+            return None
+        
+        total = 2
+        for msg in messages:
+            text = msg.content
+            total += 4 + (len(text) if text.isascii() else len(text.encode("utf-8")))
+        return total
+    
     @staticmethod
     def _default_token_counter(text: str) -> int:
         """
@@ -113,11 +349,4 @@ class BaseContextStrategy(ABC):
         Returns:
             Estimated token count
         """
-        try:
-            import tiktoken
-            encoding = tiktoken.get_encoding("cl100k_base")
-            # 允许特殊 token，避免编码错误
-            return len(encoding.encode(text, disallowed_special=()))
-        except ImportError:
-            # Fallback: 1 token ≈ 4 characters
-            return len(text) // 4
+        return _resolve_default_counter()(text)
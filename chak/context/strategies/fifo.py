@@ -1,11 +1,16 @@
 # chak/context/strategies/fifo.py
 """FIFO (First In First Out) context management strategy."""
 
-from typing import List, Optional, Callable
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional, Callable, Tuple
 
-from .base import BaseContextStrategy, StrategyRequest, StrategyResponse
-from ...exceptions import ContextError
-from ...message import Message, MarkerMessage, SystemMessage, HumanMessage
+from .base import BaseContextStrategy, StrategyRequest, StrategyResponse, _prefix_unchanged, _snapshot_messages
+from ...message import Message, MarkerMessage
+
+# Roles that are not part of the conversation turns (SystemMessage, MarkerMessage).
+# Hot loops dispatch on the role tag every message carries instead of isinstance.
+_NON_CONVERSATION_ROLES = frozenset(("system", "context"))
 
 
 class FIFOStrategy(BaseContextStrategy):
@@ -84,6 +89,10 @@ class FIFOStrategy(BaseContextStrategy):
             raise ValueError(
                 "At least one of keep_recent_turns or max_input_tokens must be specified"
             )
+        
+        # Last untruncated result, reused while its messages are unchanged and only appended to:
+        # (message snapshot, human count, total tokens or None, limits)
+        self._last_state: Optional[tuple] = None
     
     def process(self, request: StrategyRequest) -> StrategyResponse:
         """
@@ -108,14 +117,18 @@ class FIFOStrategy(BaseContextStrategy):
         if not messages:
             return StrategyResponse(messages=[])
         
-        # 1. Separate by type
-        system_messages = [m for m in messages if isinstance(m, SystemMessage)]
-        conversation_messages = [
-            m for m in messages 
-            if not isinstance(m, (SystemMessage, MarkerMessage))
-        ]
+        # Fast path: short conversations that cannot hit either limit
+        if self._within_limits_fast(messages):
+            return StrategyResponse(messages=messages)
         
-        if not conversation_messages:
+        # Incremental path: the last untruncated call's messages, only appended to
+        if self._within_limits_after_append(messages):
+            return StrategyResponse(messages=messages)
+        
+        # 1. Classify messages and derive turn boundaries / token counts in one pass
+        system_messages, conversation_indices, human_positions, message_tokens = self._analyze(messages)
+        
+        if not conversation_indices:
             return StrategyResponse(messages=messages)
         
         # 2. Check if truncation needed
@@ -124,26 +137,30 @@ class FIFOStrategy(BaseContextStrategy):
         
         # 2a. Check turn-based truncation
         if self.keep_recent_turns is not None:
-            preserve_start_idx = self._find_preserve_start(list(conversation_messages))
+            preserve_start_idx = self._find_preserve_start(human_positions)
             if preserve_start_idx is not None and preserve_start_idx > 0:
                 need_truncate = True
         
         # 2b. Check token-based truncation
-        if self.max_input_tokens is not None:
-            # Calculate current tokens
-            messages_to_check = list(system_messages) + list(conversation_messages)
-            total_tokens = self.count_messages_tokens(list(messages_to_check))
+        total_tokens = None
+        if message_tokens is not None:
+            system_tokens = self.count_messages_tokens(system_messages)
+            total_tokens = system_tokens + sum(message_tokens)
             
             if total_tokens > self.max_input_tokens:
                 need_truncate = True
                 # Find preserve boundary that satisfies token limit
                 preserve_start_idx = self._find_preserve_start_by_tokens(
-                    list(system_messages),
-                    list(conversation_messages)
+                    system_tokens,
+                    message_tokens
                 )
         
         # 3. If no truncation needed, return original
         if not need_truncate or preserve_start_idx is None or preserve_start_idx == 0:
+            self._last_state = (
+                _snapshot_messages(messages), len(human_positions), total_tokens,
+                (self.keep_recent_turns, self.max_input_tokens)
+            )
             return StrategyResponse(messages=messages)
         
         # 4. Build truncation reason string
@@ -166,49 +183,158 @@ class FIFOStrategy(BaseContextStrategy):
         )
         
         # 6. Find insertion position in original messages
-        preserve_message = conversation_messages[preserve_start_idx]
-        insert_idx = self._find_message_index_in_original(messages, preserve_message)
-        
-        # 7. Build new messages with marker inserted
-        new_messages = (
-            messages[:insert_idx] + 
-            [marker] + 
-            messages[insert_idx:]
-        )
+        insert_idx = conversation_indices[preserve_start_idx]
+        
+        # 7. Build new messages with marker inserted (one copy + in-place insert)
+        new_messages = messages.copy()
+        new_messages.insert(insert_idx, marker)
         
         return StrategyResponse(messages=new_messages)
     
-    def _find_preserve_start(self, conversation_messages: List[Message]) -> Optional[int]:
+    def _within_limits_fast(self, messages: List[Message]) -> bool:
+        """
+        Check, without tokenizing, whether neither limit can trigger truncation.
+        
+        - Turns: truncation needs keep_recent_turns + 1 HumanMessages plus at
+          least one earlier message, so it cannot happen with
+          len(messages) <= keep_recent_turns + 1.
+        - Tokens: an upper bound on the token count that fits the budget
+          means the exact count does too.
+        
+        Args:
+            messages: Original message list
+            
+        Returns:
+            True if truncation is impossible, False if a full check is needed
+        """
+        if self.keep_recent_turns is not None and len(messages) > self.keep_recent_turns + 1:
+            return False
+        
+        if self.max_input_tokens is not None:
+            upper_bound = self._max_possible_tokens(messages)
+            if upper_bound is None or upper_bound > self.max_input_tokens:
+                return False
+        
+        return True
+    
+    def _within_limits_after_append(self, messages: List[Message]) -> bool:
+        """
+        Reuse the last untruncated result when messages were only appended since.
+        
+        Conversation appends to its history between turns, so the previous
+        human count and token total can be extended by just the new tail
+        instead of re-analyzing the whole history. Any replaced, removed or
+        edited earlier message forces a full check.
+        
+        Args:
+            messages: Original message list
+            
+        Returns:
+            True if truncation is still impossible, False if a full check is needed
+        """
+        state = self._last_state
+        if state is None or not _prefix_unchanged(messages, state[0]):
+            return False
+        
+        return self._extend_last_state(messages, messages[len(state[0][0]):])
+    
+    def _extend_last_state(self, messages: List[Message], appended: List[Message]) -> bool:
+        """
+        Extend the last untruncated state by appended messages and re-check limits.
+        
+        Args:
+            messages: Full message list after the append
+            appended: Messages added since the last state was recorded
+            
+        Returns:
+            True (and records the new state) if truncation is still impossible
+        """
+        _, human_count, total_tokens, limits = self._last_state
+        if limits != (self.keep_recent_turns, self.max_input_tokens):
+            return False
+        
+        for m in appended:
+            role = m.role
+            if role == "context":
+                continue
+            if role == "user":
+                human_count += 1
+            if total_tokens is not None:
+                total_tokens += 4 + self._content_tokens(m)
+        
+        if self.keep_recent_turns is not None and human_count > self.keep_recent_turns:
+            return False
+        if total_tokens is not None and total_tokens > self.max_input_tokens:
+            return False
+        
+        self._last_state = (_snapshot_messages(messages), human_count, total_tokens, limits)
+        return True
+    
+    def _analyze(
+        self,
+        messages: List[Message]
+    ) -> Tuple[List[Message], List[int], List[int], Optional[List[int]]]:
+        """
+        Classify messages and derive everything process() needs in a single pass.
+        
+        Args:
+            messages: Original message list
+            
+        Returns:
+            (system_messages, conversation_indices, human_positions, message_tokens)
+            - conversation_indices: index in the original list of each conversation
+              message (excluding system and markers)
+            - human_positions: positions of HumanMessages among conversation messages
+            - message_tokens: per-conversation-message token counts (including format
+              overhead), or None if max_input_tokens is not set
+        """
+        system_messages: List[Message] = []
+        conversation_indices: List[int] = []
+        human_positions: List[int] = []
+        message_tokens: Optional[List[int]] = None
+        if self.max_input_tokens is not None:
+            message_tokens = []
+            self._prime_token_cache(messages)
+        
+        for i, m in enumerate(messages):
+            role = m.role
+            if role not in _NON_CONVERSATION_ROLES:
+                if role == "user":
+                    human_positions.append(len(conversation_indices))
+                conversation_indices.append(i)
+                if message_tokens is not None:
+                    message_tokens.append(4 + self._content_tokens(m))
+            elif role == "system":
+                system_messages.append(m)
+        
+        return system_messages, conversation_indices, human_positions, message_tokens
+    
+    def _find_preserve_start(self, human_positions: List[int]) -> Optional[int]:
         """
         Find the start index of messages to preserve based on keep_recent_turns.
         
-        Logic: Find the (keep_recent_turns + 1)th HumanMessage from the end.
+        Logic: Take the (keep_recent_turns + 1)th HumanMessage from the end.
         
         Args:
-            conversation_messages: Conversation messages (excluding system and markers)
+            human_positions: Positions of HumanMessages among conversation messages
             
         Returns:
-            Start index in conversation_messages, or None if no truncation needed
+            Start index in conversation messages, or None if no truncation needed
         """
-        if not conversation_messages or self.keep_recent_turns is None:
+        if self.keep_recent_turns is None:
+            return None
+        
+        target = self.keep_recent_turns + 1
+        if len(human_positions) < target:
+            # Not enough turns to truncate
             return None
         
-        # Find HumanMessage positions from end to start
-        human_indices = []
-        for i in range(len(conversation_messages) - 1, -1, -1):
-            if isinstance(conversation_messages[i], HumanMessage):
-                human_indices.append(i)
-                # Found the (keep_recent_turns + 1)th HumanMessage
-                if len(human_indices) == self.keep_recent_turns + 1:
-                    return human_indices[-1]  # Return the earliest one
-        
-        # Not enough turns to truncate
-        return None
+        return human_positions[-target]
     
     def _find_preserve_start_by_tokens(
         self,
-        system_messages: List[Message],
-        conversation_messages: List[Message]
+        system_tokens: int,
+        message_tokens: List[int]
     ) -> Optional[int]:
         """
         Find the start index of messages to preserve based on token limit.
@@ -216,55 +342,31 @@ class FIFOStrategy(BaseContextStrategy):
         Logic: Keep adding messages from the end until token limit is reached.
         
         Args:
-            system_messages: System messages (always included)
-            conversation_messages: Conversation messages
+            system_tokens: Token count of system messages (always included)
+            message_tokens: Per-message token counts of conversation messages
+                            (including format overhead)
             
         Returns:
             Start index in conversation_messages, or None if all messages fit
         """
-        if not conversation_messages or self.max_input_tokens is None:
+        if not message_tokens or self.max_input_tokens is None:
             return None
         
-        system_tokens = self.count_messages_tokens(list(system_messages))
         remaining_budget = self.max_input_tokens - system_tokens
+        last_idx = len(message_tokens) - 1
         
         if remaining_budget <= 0:
             # System messages already exceed limit, keep only last message
-            return len(conversation_messages) - 1
-        
-        # Add messages from end to start
-        current_tokens = 0
-        for i in range(len(conversation_messages) - 1, -1, -1):
-            msg_tokens = 4 + self.count_tokens(conversation_messages[i].content or "")
-            if current_tokens + msg_tokens <= remaining_budget:
-                current_tokens += msg_tokens
-            else:
-                # Found the boundary, preserve from i+1 onwards
-                return i + 1
-        
-        # All messages fit within budget
-        return None
-    
-    def _find_message_index_in_original(
-        self, 
-        original_messages: List[Message], 
-        target_message: Message
-    ) -> int:
-        """
-        Find the index of target message in original message list.
+            return last_idx
         
-        Args:
-            original_messages: Original message list
-            target_message: Target message to find
-            
-        Returns:
-            Index of target message in original list
-            
-        Raises:
-            ContextError: If target message not found
-        """
-        for i, msg in enumerate(original_messages):
-            if msg is target_message:
-                return i
-        raise ContextError("Target message not found in original messages")
-
+        # Token totals of the last 1, 2, ... N messages; every message costs at
+        # least 4 tokens, so this is strictly increasing and can be bisected
+        suffix_tokens = list(accumulate(reversed(message_tokens)))
+        kept = bisect_right(suffix_tokens, remaining_budget)
+        
+        if kept == len(message_tokens):
+            # All messages fit within budget
+            return None
+        
+        # Preserve the last `kept` messages (but always at least the most recent one)
+        return min(len(message_tokens) - kept, last_idx)
@@ -1,16 +1,77 @@
 # chak/context/strategies/lru.py
 """LRU (Least Recently Used) context strategy - Auto-prune cold topics."""
 
-from typing import List, Optional, Callable
+import asyncio
+import weakref
+from collections import deque
+from typing import Deque, List, Optional, Callable, Tuple
 
-from .base import BaseContextStrategy, StrategyRequest, StrategyResponse
-from .summarize import SummarizationStrategy
+from .base import (
+    BaseContextStrategy, StrategyRequest, StrategyResponse, _prefix_unchanged, _snapshot_messages, _truncate_middle
+)
+from .summarize import (
+    SummarizationStrategy, _SEGMENT_LABELS, _acquire_summarizer_provider, _release_summarizer_provider
+)
 from ...exceptions import ContextError
 from ...message import Message, MarkerMessage, HumanMessage, AIMessage, SystemMessage
-from ...providers import create_provider
-from ...providers.types import ProviderCategory
 from ...utils.logger import logger
-from ...utils.uri import parse as parse_uri
+
+
+# Topic-focused system prompt for re-summarization (in English).
+# It is static; the recent marker summaries are sent in the user message (see _HOT_TOPIC_USER_TEMPLATE).
+_HOT_TOPIC_SYSTEM_INST = (
+    "You are a conversation summarizer. Your task is to create a CUMULATIVE summary, "
+    "but ONLY keep content related to RECENT HOT TOPICS.\n\n"
+    "The input has two sections: 'Recent Context' (the last N summaries, which define "
+    "the hot topics) and 'Conversation History' (the rounds to summarize).\n\n"
+    "## Output Structure (MANDATORY)\n\n"
+    "[Summary]\n"
+    "Each round should have:\n"
+    "  - Topic: <what this round discussed>\n"
+    "  - User Intent: <what user wanted in this round>\n"
+    "  - Summary: <CONCISE summary - 3-5 bullet points max>\n\n"
+    "---\n\n"
+    "## CRITICAL RULES\n\n"
+    "### Rule 1: Only Keep Hot-Topic-Related Rounds\n"
+    "- Compare each round with the RECENT CONTEXT section of the input\n"
+    "- If a round is UNRELATED to recent topics → **SKIP IT COMPLETELY**\n"
+    "- Only summarize rounds related to recent hot topics\n"
+    "- This keeps conversation focused, avoids context pollution\n\n"
+    "### Rule 2: Handle Previous Summaries\n"
+    "- If a round in 'Previous Summary' is UNRELATED to recent topics → Skip\n"
+    "- If a round in 'Previous Summary' is RELATED to recent topics → Keep and refine\n\n"
+    "### Rule 3: New Rounds Must Be CONCISE\n"
+    "- Each bullet point: 1-2 sentences maximum\n"
+    "- Remove examples, detailed explanations, tables, formulas\n"
+    "- Focus on: core concepts, main conclusions, key differences\n\n"
+    "---\n\n"
+    "## Example\n\n"
+    "Suppose recent topics are 'Machine Learning, Deep Learning', history has Python, Java, ML rounds:\n\n"
+    "Wrong Output (includes unrelated topics):\n"
+    "[Summary]\n"
+    "ROUND 1: Python basics...\n"
+    "ROUND 2: Java basics...\n"
+    "ROUND 3: Machine Learning...\n\n"
+    "Correct Output (only hot topics):\n"
+    "[Summary]\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "📌 ROUND 1\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Topic: Machine Learning Intro\n"
+    "User Intent: Understand ML basics\n\n"
+    "Summary:\n"
+    "- ML enables computers to learn from data\n"
+    "- Three main types: supervised, unsupervised, reinforcement learning\n"
+    "- Common algorithms: linear regression, decision trees, neural networks\n"
+)
+
+# User message for re-summarization: recent marker summaries + history to summarize
+_HOT_TOPIC_USER_TEMPLATE = (
+    "## Recent Context (Last N Summaries)\n"
+    "{recent_context}\n\n"
+    "## Conversation History\n"
+    "{history}"
+)
 
 
 class LRUStrategy(BaseContextStrategy):
@@ -42,6 +103,11 @@ class LRUStrategy(BaseContextStrategy):
     - token_counter (Optional[Callable[[str], int]]): Custom token counter
     - summarizer_model_uri (str): Summarizer model URI
     - summarizer_api_key (str): Summarizer model API key
+    - progressive_compress (bool): Compact older assistant/tool outputs before summarizing (default False)
+    - background_summarize (bool): Summarize in a worker thread, off the request path (default False)
+    - min_summarize_interval (int): Minimum process() calls between two summarizations (default 0 = no limit)
+    - retrigger_margin (float): After a summary, re-trigger only above trigger_tokens * (1 + margin) (default 0.0)
+    - min_savings_tokens (int): Skip summarizing when the summarizable span is smaller than this (default 0)
     
     Internal Implementation (transparent to developers):
     - Automatically analyzes recent 5 markers to extract hot topics
@@ -81,7 +147,12 @@ class LRUStrategy(BaseContextStrategy):
         prefer_recent_turns: int = 2,
         token_counter: Optional[Callable[[str], int]] = None,
         summarizer_model_uri: str = "",
-        summarizer_api_key: str = ""
+        summarizer_api_key: str = "",
+        progressive_compress: bool = False,
+        background_summarize: bool = False,
+        min_summarize_interval: int = 0,
+        retrigger_margin: float = 0.0,
+        min_savings_tokens: int = 0
     ):
         """Initialize LRU Strategy.
         
@@ -92,6 +163,11 @@ class LRUStrategy(BaseContextStrategy):
             token_counter: Custom token counting function
             summarizer_model_uri: Summarizer model URI (required)
             summarizer_api_key: Summarizer model API key (required)
+            progressive_compress: Compact older assistant/tool outputs before summarizing
+            background_summarize: Run the summarizer in a worker thread (marker lands on a later call)
+            min_summarize_interval: Minimum process() calls between two summarizations
+            retrigger_margin: Hysteresis ratio applied to trigger_tokens once a summary exists
+            min_savings_tokens: Skip summarizing spans smaller than this many tokens
             
         Note:
             - Parameters identical to SummarizationStrategy
@@ -105,6 +181,11 @@ class LRUStrategy(BaseContextStrategy):
         self.prefer_recent_turns = prefer_recent_turns
         self.summarizer_model_uri = summarizer_model_uri
         self.summarizer_api_key = summarizer_api_key
+        self.progressive_compress = progressive_compress
+        self.background_summarize = background_summarize
+        self.min_summarize_interval = min_summarize_interval
+        self.retrigger_margin = retrigger_margin
+        self.min_savings_tokens = min_savings_tokens
         
         # Internally create SummarizationStrategy instance (transparent to developers)
         self._summarization_strategy = SummarizationStrategy(
@@ -113,8 +194,27 @@ class LRUStrategy(BaseContextStrategy):
             prefer_recent_turns=prefer_recent_turns,
             token_counter=token_counter,
             summarizer_model_uri=summarizer_model_uri,
-            summarizer_api_key=summarizer_api_key
+            summarizer_api_key=summarizer_api_key,
+            progressive_compress=progressive_compress,
+            background_summarize=background_summarize,
+            min_summarize_interval=min_summarize_interval,
+            retrigger_margin=retrigger_margin,
+            min_savings_tokens=min_savings_tokens
         )
+        
+        # Summary marker indices from the last scan: (message snapshot, marker count, indices)
+        self._marker_scan: Optional[tuple] = None
+        
+        # Topic-focused system prompt never changes: build the message once
+        self._system_message = SystemMessage(content=_HOT_TOPIC_SYSTEM_INST)
+        
+        # Summarizer provider, acquired from the shared pool (same config as the wrapped summarizer) on first use,
+        # and the finalizer returning it to the pool (run by close() or when garbage collected)
+        self._provider = None
+        self._provider_release: Optional[weakref.finalize] = None
+        
+        # Last processed input and its response: (message snapshot, limits, response)
+        self._last_call: Optional[tuple] = None
     
     def process(self, request: StrategyRequest) -> StrategyResponse:
         """
@@ -136,37 +236,112 @@ class LRUStrategy(BaseContextStrategy):
             Strategy response with processed messages (cold topics pruned)
         """
         
+        # Unchanged input since the last call: reuse its response (no LLM round trip)
+        cached = self._reuse_last_call(request.messages)
+        if cached is not None:
+            return cached
+        
+        response = self._process(request)
+        if request.messages:
+            self._last_call = (_snapshot_messages(request.messages), self._limits(), response)
+        return response
+    
+    async def aprocess(self, request: StrategyRequest) -> StrategyResponse:
+        """
+        Async version of process().
+        
+        An unchanged input is answered from the last response directly;
+        otherwise summarization and pruning (both blocking LLM calls) run in
+        a worker thread.
+        
+        Args:
+            request: Strategy request containing message list
+            
+        Returns:
+            Strategy response with processed messages (cold topics pruned)
+        """
+        cached = self._reuse_last_call(request.messages)
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.process, request)
+    
+    def reset(self) -> None:
+        """Drop per-conversation caches (called by Conversation.reset)."""
+        self._summarization_strategy.reset()
+        self._marker_scan = None
+        self._last_call = None
+    
+    def close(self) -> None:
+        """Release the wrapped summarizer and this strategy's summarizer provider (called by Conversation.close)."""
+        self._summarization_strategy.close()
+        self._marker_scan = None
+        self._last_call = None
+        if self._provider_release is not None:
+            self._provider = None
+            self._provider_release()
+            self._provider_release = None
+    
+    def _limits(self) -> tuple:
+        """Settings of the wrapped summarizer that decide whether it triggers."""
+        summarizer = self._summarization_strategy
+        return (summarizer.trigger_tokens, summarizer.prefer_recent_turns)
+    
+    def _reuse_last_call(self, messages: List[Message]) -> Optional[StrategyResponse]:
+        """
+        Return the previous response if called again with the same, unmodified input.
+        
+        The input must hold exactly the messages the response was built from,
+        each with the same content; any replaced or edited message is a miss.
+        
+        Args:
+            messages: Input message list of the current request
+            
+        Returns:
+            Previous StrategyResponse, or None if anything changed
+        """
+        last = self._last_call
+        if last is None or not messages:
+            return None
+        snapshot, limits, response = last
+        if (
+            len(messages) == len(snapshot[0])
+            and _prefix_unchanged(messages, snapshot)
+            and limits == self._limits()
+        ):
+            logger.debug("[LRU] Skip: input unchanged since last call")
+            return response
+        return None
+    
+    def _process(self, request: StrategyRequest) -> StrategyResponse:
+        """Run summarization followed by LRU topic pruning (see process)."""
         # Step 1: Let summarization do its job
         result = self._summarization_strategy.process(request)
         messages = result.messages
         
-        # Step 2: Extract all summary markers
-        marker_indices = []
-        for i, msg in enumerate(messages):
-            if isinstance(msg, MarkerMessage) and msg.metadata.get("type") == "summary":
-                marker_indices.append(i)
+        # Step 2: Count summary markers and keep the most recent ones
+        marker_count, recent_marker_indices = self._find_summary_markers(messages)
         
         # Step 3: Check if topic pruning is needed
-        if len(marker_indices) <= self._DEFAULT_RECENT_MARKERS_COUNT:
-            logger.debug(f"[LRU] Skip: Only {len(marker_indices)} markers, no pruning needed")
+        if marker_count <= self._DEFAULT_RECENT_MARKERS_COUNT:
+            logger.debug("[LRU] Skip: Only {} markers, no pruning needed", marker_count)
             return result
         
-        logger.debug(f"\n🗑️  [LRU] Starting topic pruning")
-        logger.debug(f"   Total markers: {len(marker_indices)}")
-        logger.debug(f"   Analyzing recent: {self._DEFAULT_RECENT_MARKERS_COUNT}")
+        logger.debug(
+            "\n🗑️  [LRU] Starting topic pruning\n   Total markers: > {0}\n   Analyzing recent: {0}",
+            self._DEFAULT_RECENT_MARKERS_COUNT
+        )
         
         # Step 4: Extract recent N markers (for context)
-        recent_marker_indices = marker_indices[-self._DEFAULT_RECENT_MARKERS_COUNT:]
         recent_markers = [messages[i] for i in recent_marker_indices]
         
-        logger.debug(f"   Recent markers: {len(recent_markers)}")
+        logger.debug("   Recent markers: {}", len(recent_markers))
         
         # Step 5: Find original messages corresponding to last marker
-        last_marker_idx = marker_indices[-1]
+        last_marker_idx = recent_marker_indices[-1]
         
         # Find position of second-to-last marker (if exists)
-        if len(marker_indices) >= 2:
-            prev_marker_idx = marker_indices[-2]
+        if len(recent_marker_indices) >= 2:
+            prev_marker_idx = recent_marker_indices[-2]
             summarize_start = prev_marker_idx
         else:
             summarize_start = 0
@@ -174,7 +349,7 @@ class LRUStrategy(BaseContextStrategy):
         # Messages to summarize: from summarize_start to last_marker_idx (exclusive)
         to_summarize = messages[summarize_start:last_marker_idx]
         
-        logger.debug(f"   Re-summarizing message range: [{summarize_start}:{last_marker_idx}]")
+        logger.debug("   Re-summarizing message range: [{}:{}]", summarize_start, last_marker_idx)
         
         # Step 6: Regenerate last marker (only keep hot topics)
         new_summary = self._regenerate_summary_with_hot_topics(
@@ -182,7 +357,7 @@ class LRUStrategy(BaseContextStrategy):
             recent_markers
         )
         
-        logger.debug(f"   ✅ Hot-topic-focused summary generated")
+        logger.debug("   ✅ Hot-topic-focused summary generated")
         
         # Step 7: Create new LRU marker (insert after original marker, not replace)
         lru_marker = MarkerMessage(
@@ -197,16 +372,78 @@ class LRUStrategy(BaseContextStrategy):
         
         # Step 8: Insert LRU marker AFTER the last summary marker (keep original)
         # This makes it easy to see LRU is working in tests
-        new_messages = (
-            messages[:last_marker_idx + 1] +  # Keep original summary marker
-            [lru_marker] +                      # Add LRU marker
-            messages[last_marker_idx + 1:]     # Keep subsequent messages
-        )
+        new_messages = messages.copy()
+        new_messages.insert(last_marker_idx + 1, lru_marker)
         
-        logger.debug(f"   Marker replacement complete\n")
+        logger.debug("   Marker replacement complete\n")
         
         return StrategyResponse(messages=new_messages)
     
+    def _find_summary_markers(self, messages: List[Message]) -> Tuple[int, List[int]]:
+        """
+        Count summary markers (saturating) and locate the most recent ones.
+        
+        Pruning only needs to know whether there are more than
+        _DEFAULT_RECENT_MARKERS_COUNT markers and where the most recent ones
+        are. A full scan therefore walks backwards and stops as soon as
+        _DEFAULT_RECENT_MARKERS_COUNT + 1 markers are found. Messages are
+        normally only appended between calls, so when the previously scanned
+        prefix is still in place only the new tail is scanned.
+        
+        Args:
+            messages: Complete message list
+            
+        Returns:
+            (marker count capped at _DEFAULT_RECENT_MARKERS_COUNT + 1,
+             indices of the most recent markers in order)
+        """
+        keep = self._DEFAULT_RECENT_MARKERS_COUNT
+        cap = keep + 1
+        recent: Deque[int] = deque(maxlen=keep)
+        
+        scan = self._marker_scan
+        if scan is not None and _prefix_unchanged(messages, scan[0]):
+            # Prefix unchanged: extend the previous result by the appended tail
+            snapshot, count, prev_recent = scan
+            prev_len = len(snapshot[0])
+            recent.extend(prev_recent)
+            for i in range(prev_len, len(messages)):
+                msg = messages[i]
+                if msg.role == "context" and msg.metadata.get("type") == "summary":
+                    recent.append(i)
+                    count = min(count + 1, cap)
+        else:
+            # Full scan from the end, stopping once pruning is known to be needed
+            count = 0
+            for i in range(len(messages) - 1, -1, -1):
+                msg = messages[i]
+                if msg.role == "context" and msg.metadata.get("type") == "summary":
+                    count += 1
+                    if count == cap:
+                        break
+                    recent.appendleft(i)
+        
+        if messages:
+            self._marker_scan = (_snapshot_messages(messages), count, tuple(recent))
+        return count, list(recent)
+    
+    def _get_provider(self):
+        """Get the summarizer provider on first use and reuse it (and its HTTP client) afterwards."""
+        if self._provider is None:
+            key = self._summarization_strategy._provider_key()
+            self._provider = _acquire_summarizer_provider(key)
+            # A strategy dropped without close() still releases its reference
+            self._provider_release = weakref.finalize(self, _release_summarizer_provider, key)
+        return self._provider
+    
+    def _format_segment(self, m: Message) -> Tuple[str, str]:
+        """Return the (role label, stripped text) used for a message in the prompt; long texts are cut to head + tail."""
+        role = m.role
+        if role == "context":
+            return "Previous Summary", m.metadata.get('summary', '').strip()
+        # Raw dumps (files, code) add bytes but little topic signal
+        return _SEGMENT_LABELS.get(role, "Message"), _truncate_middle(self._stripped_content(m))
+    
     def _regenerate_summary_with_hot_topics(
         self, 
         messages: List[Message], 
@@ -228,101 +465,32 @@ class LRUStrategy(BaseContextStrategy):
             Summary text (only hot topics)
         """
         # Build content (same as SummarizationStrategy._llm_summarize)
-        segments: List[str] = []
-        for m in messages:
-            if isinstance(m, HumanMessage):
-                role = "User"
-                text = (m.content or "").strip()
-            elif isinstance(m, AIMessage):
-                role = "Assistant"
-                text = (m.content or "").strip()
-            elif isinstance(m, MarkerMessage):
-                role = "Previous Summary"
-                text = m.metadata.get('summary', '').strip()
-            else:
-                role = "Message"
-                text = (m.content or "").strip()
-            
-            if text:
-                segments.append(f"{role}: {text}")
-        
-        prompt = "\n".join(segments)
+        prompt = "\n".join(
+            f"{role}: {text}"
+            for role, text in map(self._format_segment, messages)
+            if text
+        )
         if not prompt:
             raise ContextError("No valid content to summarize")
         
         # Extract recent marker summaries for context
-        recent_summaries = [
-            marker.metadata.get('summary', '')
+        # Consecutive markers can repeat the same summary; send each text once
+        recent_summaries = list(dict.fromkeys(
+            summary
             for marker in recent_markers
-            if marker.metadata.get('summary')
-        ]
+            if (summary := marker.metadata.get('summary'))
+        ))
         recent_context = "\n\n---\n\n".join(recent_summaries) if recent_summaries else "No recent context"
         
-        # Build topic-focused system prompt (in English)
-        system_inst = (
-            "You are a conversation summarizer. Your task is to create a CUMULATIVE summary, "
-            "but ONLY keep content related to RECENT HOT TOPICS.\n\n"
-            "## Recent Context (Last N Summaries)\n"
-            f"{recent_context}\n\n"
-            "## Output Structure (MANDATORY)\n\n"
-            "[Summary]\n"
-            "Each round should have:\n"
-            "  - Topic: <what this round discussed>\n"
-            "  - User Intent: <what user wanted in this round>\n"
-            "  - Summary: <CONCISE summary - 3-5 bullet points max>\n\n"
-            "---\n\n"
-            "## CRITICAL RULES\n\n"
-            "### Rule 1: Only Keep Hot-Topic-Related Rounds\n"
-            "- Compare each round with RECENT CONTEXT above\n"
-            "- If a round is UNRELATED to recent topics → **SKIP IT COMPLETELY**\n"
-            "- Only summarize rounds related to recent hot topics\n"
-            "- This keeps conversation focused, avoids context pollution\n\n"
-            "### Rule 2: Handle Previous Summaries\n"
-            "- If a round in 'Previous Summary' is UNRELATED to recent topics → Skip\n"
-            "- If a round in 'Previous Summary' is RELATED to recent topics → Keep and refine\n\n"
-            "### Rule 3: New Rounds Must Be CONCISE\n"
-            "- Each bullet point: 1-2 sentences maximum\n"
-            "- Remove examples, detailed explanations, tables, formulas\n"
-            "- Focus on: core concepts, main conclusions, key differences\n\n"
-            "---\n\n"
-            "## Example\n\n"
-            "Suppose recent topics are 'Machine Learning, Deep Learning', history has Python, Java, ML rounds:\n\n"
-            "Wrong Output (includes unrelated topics):\n"
-            "[Summary]\n"
-            "ROUND 1: Python basics...\n"
-            "ROUND 2: Java basics...\n"
-            "ROUND 3: Machine Learning...\n\n"
-            "Correct Output (only hot topics):\n"
-            "[Summary]\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "📌 ROUND 1\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "Topic: Machine Learning Intro\n"
-            "User Intent: Understand ML basics\n\n"
-            "Summary:\n"
-            "- ML enables computers to learn from data\n"
-            "- Three main types: supervised, unsupervised, reinforcement learning\n"
-            "- Common algorithms: linear regression, decision trees, neural networks\n"
-        )
-        
-        # Call LLM
-        parsed = parse_uri(self.summarizer_model_uri)
-        config_dict = {
-            'api_key': self.summarizer_api_key,
-            'model': parsed['model']
-        }
-        if parsed['base_url']:
-            config_dict['base_url'] = parsed['base_url']
-        
-        provider = create_provider(
-            parsed['provider'],
-            config_dict,
-            category=ProviderCategory.LLM
-        )
+        # Call LLM (system prompt is static; recent context goes with the history)
+        provider = self._get_provider()
         
         summarize_messages = [
-            SystemMessage(content=system_inst),
-            HumanMessage(content=prompt)
+            self._system_message,
+            HumanMessage(content=_HOT_TOPIC_USER_TEMPLATE.format(
+                recent_context=recent_context,
+                history=prompt
+            ))
         ]
         
         response = provider.send(
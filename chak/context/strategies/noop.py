@@ -37,3 +37,7 @@ class NoopStrategy(BaseContextStrategy):
             Strategy response with all messages unchanged
         """
         return StrategyResponse(messages=request.messages)
+    
+    async def aprocess(self, request: StrategyRequest) -> StrategyResponse:
+        """Pass-through never blocks, so skip the worker thread."""
+        return self.process(request)
@@ -1,9 +1,18 @@
 # chak/context/strategies/summarize.py
 """Summarization context strategy that compresses history via LLM summarization."""
 
-from typing import List, Optional, Callable
+import hashlib
+import io
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import weakref
+from typing import Dict, List, Literal, Optional, Callable, Tuple
 
-from .base import BaseContextStrategy, StrategyRequest, StrategyResponse
+from .base import (
+    BaseContextStrategy, StrategyRequest, StrategyResponse, _prefix_unchanged, _snapshot_messages, _truncate_middle
+)
 from ...exceptions import ContextError
 from ...message import Message, MarkerMessage, SystemMessage, HumanMessage, AIMessage
 from ...providers import create_provider
@@ -12,6 +21,134 @@ from ...utils.logger import logger
 from ...utils.uri import parse as parse_uri
 
 
+# Prompt label for each message role (markers use "Previous Summary", anything else "Message")
+_SEGMENT_LABELS = {"user": "User", "assistant": "Assistant"}
+
+# Fenced code block: ```lang\n...```
+_CODE_BLOCK_RE = re.compile(r"```([\w+-]*)[^\n]*\n(.*?)```", re.DOTALL)
+
+
+def _describe_code_block(match: "re.Match") -> str:
+    """One-line descriptor replacing a fenced code block (used by progressive_compress)."""
+    lang = match.group(1) or "text"
+    lines = match.group(2).splitlines()
+    preview = next((line.strip() for line in lines if line.strip()), "")
+    return f"[code:{lang} {len(lines)} lines, first line: {preview[:80]}]"
+
+
+# Summarizer providers shared per distinct config: key -> [provider, number of strategies using it]
+_shared_providers: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], list] = {}
+_shared_providers_lock = threading.Lock()
+
+
+def _acquire_summarizer_provider(key: Tuple[str, Tuple[Tuple[str, str], ...]]):
+    """
+    Get the summarizer provider for key (provider name, sorted config items), creating it if needed.
+    
+    Conversations that summarize concurrently then reuse a single HTTP client
+    and its connection pool instead of each opening their own. Every acquire
+    must be paired with _release_summarizer_provider; strategies register it
+    as a weakref.finalize so it also runs when they are garbage collected.
+    """
+    with _shared_providers_lock:
+        entry = _shared_providers.get(key)
+        if entry is None:
+            provider = create_provider(key[0], dict(key[1]), category=ProviderCategory.LLM)
+            entry = _shared_providers[key] = [provider, 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_summarizer_provider(key: Tuple[str, Tuple[Tuple[str, str], ...]]) -> None:
+    """Drop one reference to a shared provider; the last one closes it."""
+    with _shared_providers_lock:
+        entry = _shared_providers.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _shared_providers[key]
+    entry[0].close()
+
+
+# Summarization system prompt with few-shot examples (in English)
+_SUMMARIZER_SYSTEM_PROMPT = (
+    "You are a conversation summarizer. Your task is to create a CUMULATIVE summary "  
+    "that preserves all previous rounds and adds new round information.\n\n"
+    "## Output Structure (MANDATORY)\n\n"
+    "[Summary]\n"
+    "Each round should have:\n"
+    "  - Topic: <what this round discussed>\n"
+    "  - User Intent: <what user wanted in this round>\n"
+    "  - Summary: <CONCISE summary of key points - 3-5 bullet points max>\n\n"
+    "---\n\n"
+    "## CRITICAL RULES\n\n"
+    "### Rule 1: Previous Rounds Must Be Copied Exactly\n"
+    "If there is 'Previous Summary' in the input:\n"
+    "  1. Copy ALL previous rounds COMPLETELY (word-by-word)\n"
+    "  2. Then APPEND new round information at the end\n"
+    "  3. DO NOT shorten, compress, or rewrite previous rounds\n"
+    "  4. Think: New Summary = All Previous Rounds (unchanged) + New Round\n\n"
+    "### Rule 2: New Round Must Be CONCISE Summary\n"
+    "For the NEW round you are creating:\n"
+    "  - Extract ONLY the most important 3-5 key points\n"
+    "  - Each bullet point: 1-2 sentences maximum\n"
+    "  - Remove examples, detailed explanations, tables, formulas\n"
+    "  - Focus on: core concepts, main conclusions, key differences\n"
+    "  - DO NOT copy-paste full paragraphs from Assistant's response\n\n"
+    "Think: If someone reads only your summary, they should understand the essence.\n\n"
+    "---\n\n"
+    "## Example 1: First Summary (No Previous Summary)\n\n"
+    "Input:\n"
+    "  User: Tell me about AI history\n"
+    "  Assistant: [3000 words detailed response about AI history...]\n\n"
+    "Output:\n"
+    "[Summary]\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "📌 ROUND 1\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Topic: Artificial Intelligence History\n"
+    "User Intent: Learning AI development timeline\n\n"
+    "Summary:\n"
+    "- AI evolved through 6 stages: 1940s embryonic period, 1956 birth at Dartmouth, 1970s first winter, 1980s expert systems, 1990s second winter, 2000s+ modern rise\n"
+    "- Key milestones: 1950 Turing Test, 2006 deep learning concept, 2012 ImageNet breakthrough, 2016 AlphaGo victory\n"
+    "- Current era driven by big data, GPU computing, and breakthrough algorithms (GPT, BERT, etc.)\n\n"
+    "---\n\n"
+    "## Example 2: Second Summary (Has Previous Summary)\n\n"
+    "Input:\n"
+    "  Previous Summary: [Summary with Round 1...]\n"
+    "  User: What's the difference between ML and DL?\n"
+    "  Assistant: [2000 words with definitions, tables, examples...]\n\n"
+    "Output:\n"
+    "[Summary]\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "📌 ROUND 1 (COPIED FROM PREVIOUS SUMMARY)\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Topic: Artificial Intelligence History\n"
+    "User Intent: Learning AI development timeline\n\n"
+    "Summary:\n"
+    "- AI evolved through 6 stages: 1940s embryonic period, 1956 birth at Dartmouth, 1970s first winter, 1980s expert systems, 1990s second winter, 2000s+ modern rise\n"
+    "- Key milestones: 1950 Turing Test, 2006 deep learning concept, 2012 ImageNet breakthrough, 2016 AlphaGo victory\n"
+    "- Current era driven by big data, GPU computing, and breakthrough algorithms (GPT, BERT, etc.)\n\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "📌 ROUND 2 (NEW CONTENT)\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "Topic: Machine Learning vs Deep Learning\n"
+    "User Intent: Understanding core differences between ML and DL\n\n"
+    "Summary:\n"
+    "- Relationship: DL is a subset of ML\n"
+    "- Key differences: ML needs manual feature engineering, DL learns features automatically; ML works with small data, DL needs large datasets and GPUs\n"
+    "- ML is more interpretable (e.g., decision trees), DL is 'black box' but powerful for images/speech/text\n\n"
+    "---\n\n"
+    "## Key Points\n"
+    "- Each round has its own Topic + User Intent + Summary\n"
+    "- Previous rounds: copy exactly (word-by-word)\n"
+    "- NEW round: extract 3-5 key points ONLY (concise summary, not full content)\n"
+    "- Use the SAME LANGUAGE as input messages\n"
+)
+
+
 class SummarizationStrategy(BaseContextStrategy):
     """
     SummarizationStrategy - Lossless compression summarization strategy
@@ -45,6 +182,13 @@ class SummarizationStrategy(BaseContextStrategy):
     - token_counter (Optional[Callable[[str], int]]): Custom token counter
     - summarizer_model_uri (str): Summarizer model URI
     - summarizer_api_key (str): Summarizer model API key
+    - progressive_compress (bool): Compact older assistant/tool outputs before summarizing (default False)
+    - background_summarize (bool): Summarize in a worker thread, off the request path (default False)
+    - min_summarize_interval (int): Minimum process() calls between two summarizations (default 0 = no limit)
+    - retrigger_margin (float): After a summary, re-trigger only above trigger_tokens * (1 + margin) (default 0.0)
+    - min_savings_tokens (int): Skip summarizing when the summarizable span is smaller than this (default 0)
+    - mode (str): "summarize" (default) or "sliding": drop the older interval from the context with a
+      truncate marker instead of summarizing it (no LLM call, no summarizer config needed)
     
     Notes:
     - System messages always included in messages sent to LLM
@@ -53,6 +197,10 @@ class SummarizationStrategy(BaseContextStrategy):
     - prefer_recent_turns is target value, auto-adjusted if total turns insufficient
     """
     
+    # Internal constants for progressive_compress
+    _RECENT_VERBATIM_OUTPUTS = 3  # Most recent assistant/tool outputs kept verbatim
+    _SUMMARY_CACHE_SIZE = 128  # Summaries kept, keyed by a hash of the summarizer prompt
+    
     def __init__(
         self,
         max_input_tokens: int,
@@ -60,7 +208,13 @@ class SummarizationStrategy(BaseContextStrategy):
         prefer_recent_turns: int = 2,
         token_counter: Optional[Callable[[str], int]] = None,
         summarizer_model_uri: str = "",
-        summarizer_api_key: str = ""
+        summarizer_api_key: str = "",
+        progressive_compress: bool = False,
+        background_summarize: bool = False,
+        min_summarize_interval: int = 0,
+        retrigger_margin: float = 0.0,
+        min_savings_tokens: int = 0,
+        mode: Literal["summarize", "sliding"] = "summarize"
     ):
         """Initialize SummarizationStrategy.
         
@@ -71,6 +225,23 @@ class SummarizationStrategy(BaseContextStrategy):
             token_counter: Custom token counting function
             summarizer_model_uri: Summarizer model URI (required)
             summarizer_api_key: Summarizer model API key (required)
+            progressive_compress: Before summarizing, replace code blocks in older
+                                  assistant/tool messages with one-line descriptors and
+                                  truncate long ones (the most recent ones stay verbatim)
+            background_summarize: Run the summarizer LLM call in a worker thread. The
+                                  triggering call returns messages unchanged; the marker
+                                  is inserted by the first process() call after the
+                                  summary is ready
+            min_summarize_interval: Minimum number of process() calls after a summary
+                                    before the next one may run (0 = no limit)
+            retrigger_margin: Hysteresis once a summary exists: summarize again only when
+                              usage exceeds trigger_tokens * (1 + retrigger_margin)
+            min_savings_tokens: Skip the LLM call when the messages to be summarized hold
+                                fewer tokens than this (not worth a round-trip); never
+                                skips while usage exceeds max_input_tokens
+            mode: "summarize" replaces older messages with an LLM summary; "sliding" only
+                  cuts them from the context (truncate marker, history kept), for callers
+                  that don't need summary fidelity
             
         Note:
             - "Turn" = 1 HumanMessage + subsequent messages (until next HumanMessage)
@@ -79,25 +250,104 @@ class SummarizationStrategy(BaseContextStrategy):
             - When threshold exceeded, summarize earlier messages and insert marker
             
         Raises:
-            ValueError: If max_input_tokens is not positive or summarizer config missing
+            ValueError: If max_input_tokens is not positive, mode is unknown, or summarizer
+                        config missing in "summarize" mode
         """
         super().__init__(token_counter=token_counter)
         
         if max_input_tokens <= 0:
             raise ValueError("max_input_tokens must be positive")
-        if not summarizer_model_uri:
-            raise ValueError("summarizer_model_uri is required")
-        if not summarizer_api_key:
-            raise ValueError("summarizer_api_key is required")
+        if mode not in ("summarize", "sliding"):
+            raise ValueError(f"Invalid mode: {mode}")
+        if mode == "summarize":
+            if not summarizer_model_uri:
+                raise ValueError("summarizer_model_uri is required")
+            if not summarizer_api_key:
+                raise ValueError("summarizer_api_key is required")
         
         self.max_input_tokens = max_input_tokens
         self.summarize_threshold = summarize_threshold
         self.prefer_recent_turns = prefer_recent_turns
         self.summarizer_model_uri = summarizer_model_uri
         self.summarizer_api_key = summarizer_api_key
-        
-        # Calculate trigger point
+        self.progressive_compress = progressive_compress
+        self.background_summarize = background_summarize
+        self.min_summarize_interval = min_summarize_interval
+        self.retrigger_margin = retrigger_margin
+        self.min_savings_tokens = min_savings_tokens
+        self.mode = mode
+        # Marker type written (and treated as the context boundary) in this mode
+        self._marker_type = "summary" if mode == "summarize" else "truncate"
+        
+        # Calculate trigger point (and the raised one used after a summary)
         self.trigger_tokens = int(max_input_tokens * summarize_threshold)
+        self.retrigger_tokens = int(self.trigger_tokens * (1 + retrigger_margin))
+        
+        # Summarizer URI never changes: parse once and prepare the provider config
+        # (sliding mode never calls the summarizer)
+        self._parsed_uri = None
+        self._provider_config = None
+        if mode == "summarize":
+            self._parsed_uri = parse_uri(summarizer_model_uri)
+            self._provider_config = {
+                'api_key': summarizer_api_key,
+                'model': self._parsed_uri['model']
+            }
+            if self._parsed_uri['base_url']:
+                self._provider_config['base_url'] = self._parsed_uri['base_url']
+        
+        # Summarizer provider, fetched from the shared pool on first use, and the
+        # finalizer returning it to the pool (run by close() or when garbage collected)
+        self._provider = None
+        self._provider_release: Optional[weakref.finalize] = None
+        
+        # The summarizer system prompt never changes
+        self._system_message = SystemMessage(content=_SUMMARIZER_SYSTEM_PROMPT)
+        
+        # Recent summaries by prompt hash (LRU order), so identical history isn't re-summarized
+        self._summary_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        
+        # background_summarize: worker (created on first use) and the in-flight job
+        # (future, last summary marker when submitted, first preserved message, summarized count)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_summary: Optional[tuple] = None
+        
+        # Classification of the last seen message list:
+        # (message snapshot, system messages, last marker index, conversation indices, human positions)
+        self._classify_state: Optional[tuple] = None
+        
+        # Running token count of the analyzed messages:
+        # (message snapshot, last marker index, token counter, system count, system tokens, window tokens)
+        self._token_state: Optional[tuple] = None
+        
+        # process() calls since the last summary (None until the first one)
+        self._calls_since_summary: Optional[int] = None
+    
+    def reset(self) -> None:
+        """Drop per-conversation caches (called by Conversation.reset)."""
+        self._classify_state = None
+        self._token_state = None
+        self._calls_since_summary = None
+        if self._pending_summary is not None:
+            self._pending_summary[0].cancel()
+            self._pending_summary = None
+    
+    def close(self) -> None:
+        """
+        Release the background worker and the summarizer provider (called by Conversation.close).
+        
+        The provider is shared with other strategies using the same config; it
+        is closed when the last of them releases it. A summary already running
+        in the background is waited for, so its provider isn't closed under it.
+        """
+        self.reset()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._provider_release is not None:
+            self._provider = None
+            self._provider_release()
+            self._provider_release = None
     
     def process(self, request: StrategyRequest) -> StrategyResponse:
         """
@@ -126,131 +376,370 @@ class SummarizationStrategy(BaseContextStrategy):
         if not messages:
             return StrategyResponse(messages=[])
         
-        # 1. Classify by type
-        system_messages = [m for m in messages if isinstance(m, SystemMessage)]
-        # conversation_messages contains all conversation messages (excluding system messages and markers)
-        # Note: conversation_messages here is for finding preserve interval, only count messages after marker
-        last_marker_idx = self._find_last_summary_marker(messages)
+        if self._calls_since_summary is not None:
+            self._calls_since_summary += 1
         
-        if last_marker_idx is not None:
-            # Has marker: only count conversation messages after marker
-            conversation_messages = [
-                m for m in messages[last_marker_idx + 1:]  # After marker
-                if not isinstance(m, (SystemMessage, MarkerMessage))
-            ]
-        else:
-            # No marker: count all conversation messages
-            conversation_messages = [
-                m for m in messages 
-                if not isinstance(m, (SystemMessage, MarkerMessage))
-            ]
+        # 0. Insert a summary finished in the background since the last call
+        if self._pending_summary is not None and self._pending_summary[0].done():
+            messages = self._apply_pending_summary(messages)
+        
+        # 1. Classify by type (single pass)
+        # conversation_messages contains conversation messages (excluding system messages and markers)
+        # Note: conversation_messages here is for finding preserve interval, only count messages after marker.
+        # Original indices are kept alongside so positions map back without searching.
+        system_messages, last_marker_idx, conversation_indices, human_positions = self._classify(messages)
         
         # 2. Find last summary marker position (already found above)
         
         # 3. Determine messages to analyze: simulate messages actually sent to LLM
         #    Actual sending rule: system messages + last marker (inclusive) → last
-        if last_marker_idx is not None:
-            # Has marker: system messages + marker and messages after
-            messages_to_analyze = list(system_messages) + messages[last_marker_idx:]
-        else:
-            # No marker: system messages + all conversation messages
-            messages_to_analyze = list(system_messages) + list(conversation_messages)
-        
         # 4. Calculate current token usage (simulate actual sent tokens)
-        total_tokens = self.count_messages_tokens(list(messages_to_analyze))
+        #    Running total from the last call when messages were only appended
+        total_tokens = self._extend_token_state(messages, system_messages, last_marker_idx, conversation_indices)
+        
+        if total_tokens is None:
+            if last_marker_idx is not None:
+                # Has marker: system messages + marker and messages after
+                window = messages[last_marker_idx:]
+            else:
+                # No marker: system messages + all conversation messages
+                window = [messages[i] for i in conversation_indices]
+            
+            # Cheap upper bound first: if even that fits, skip tokenizing
+            upper_bound = self._max_possible_tokens(system_messages + window)
+            if upper_bound is not None and upper_bound <= self.trigger_tokens:
+                logger.debug("✅ [Summarization] Skip: below threshold (<= {} <= {})", upper_bound, self.trigger_tokens)
+                return StrategyResponse(messages=messages)
+            
+            system_tokens = self._message_tokens(system_messages)
+            window_tokens = self._message_tokens(window)
+            self._token_state = (
+                _snapshot_messages(messages), last_marker_idx, self.token_counter,
+                len(system_messages), system_tokens, window_tokens
+            )
+            total_tokens = 2 + system_tokens + window_tokens  # Same as count_messages_tokens
         
-        logger.debug(f"\n📊 [Summarization] Token stats: {total_tokens}/{self.max_input_tokens} (trigger={self.trigger_tokens}, {total_tokens/self.max_input_tokens*100:.1f}%)")
+        logger.debug(
+            "\n📊 [Summarization] Token stats: {}/{} (trigger={}, {:.1f}%)",
+            total_tokens, self.max_input_tokens, self.trigger_tokens,
+            total_tokens / self.max_input_tokens * 100
+        )
         
         # 5. Check if summarization needed
         if total_tokens <= self.trigger_tokens:
             # Below threshold, no summarization needed
-            logger.debug(f"✅ [Summarization] Skip: below threshold ({total_tokens} <= {self.trigger_tokens})")
+            logger.debug("✅ [Summarization] Skip: below threshold ({} <= {})", total_tokens, self.trigger_tokens)
             return StrategyResponse(messages=messages)
         
-        logger.debug(f"⚠️  [Summarization] Triggered: above threshold ({total_tokens} > {self.trigger_tokens})")
+        if self._calls_since_summary is not None and total_tokens <= self.max_input_tokens:
+            # Already summarized: hysteresis and rate limit keep us from summarizing every turn,
+            # but never at the cost of exceeding the input limit
+            if total_tokens <= self.retrigger_tokens:
+                logger.debug("✅ [Summarization] Skip: below re-trigger threshold ({} <= {})", total_tokens, self.retrigger_tokens)
+                return StrategyResponse(messages=messages)
+            if self._calls_since_summary < self.min_summarize_interval:
+                logger.debug(
+                    "✅ [Summarization] Skip: rate limited ({} < {} calls since last summary)",
+                    self._calls_since_summary, self.min_summarize_interval
+                )
+                return StrategyResponse(messages=messages)
+        
+        logger.debug("⚠️  [Summarization] Triggered: above threshold ({} > {})", total_tokens, self.trigger_tokens)
         
         # 6. Need summarization: dynamically find preserve interval start
-        preserve_start_idx, actual_turns = self._find_preserve_start_adaptive(
-            list(conversation_messages),
-            list(system_messages)
-        )
+        preserve_start_idx, actual_turns = self._find_preserve_start_adaptive(human_positions)
         
         if preserve_start_idx is None or preserve_start_idx == 0:
             # Cannot find preserve interval or no summarizable messages
-            logger.debug(f"❌ [Summarization] Cannot execute: no summarizable messages")
-            logger.debug(f"   conversation_messages length: {len(conversation_messages)}")
-            logger.debug(f"   preserve_start_idx: {preserve_start_idx}")
+            logger.debug(
+                "❌ [Summarization] Cannot execute: no summarizable messages\n"
+                "   conversation_messages length: {}\n"
+                "   preserve_start_idx: {}",
+                len(conversation_indices), preserve_start_idx
+            )
             return StrategyResponse(messages=messages)
         
         # 7. Determine summarization interval
-        if last_marker_idx is not None:
-            # Has marker: from last marker to preserve interval start
-            # Need to find absolute position of preserve interval in original messages
-            # preserve_start_idx in conversation_messages corresponds to position in original messages
-            preserve_start_in_original = self._find_message_index_in_original(
-                messages, conversation_messages[preserve_start_idx]
-            )
-            summarize_start = last_marker_idx
-            summarize_end = preserve_start_in_original
-        else:
-            # No marker: from beginning to preserve interval start
-            preserve_start_in_original = self._find_message_index_in_original(
-                messages, conversation_messages[preserve_start_idx]
-            )
-            summarize_start = 0
-            summarize_end = preserve_start_in_original
+        # preserve_start_idx in conversation_messages corresponds to position in original messages
+        preserve_start_in_original = conversation_indices[preserve_start_idx]
+        # Has marker: from last marker to preserve interval start; no marker: from beginning
+        summarize_start = last_marker_idx if last_marker_idx is not None else 0
+        summarize_end = preserve_start_in_original
         
         to_summarize = messages[summarize_start:summarize_end]
         
+        if self.min_savings_tokens and total_tokens <= self.max_input_tokens:
+            # Token counts are cached on the messages, so this estimate is cheap;
+            # above the input limit the span is cut however little it saves
+            savings = self._message_tokens(to_summarize)
+            if savings < self.min_savings_tokens:
+                logger.debug(
+                    "✅ [Summarization] Skip: too little to save ({} < {} tokens)",
+                    savings, self.min_savings_tokens
+                )
+                return StrategyResponse(messages=messages)
+        
         # Print summarization interval info
-        logger.debug(f"\n📋 [Summarization] Executing:")
-        logger.debug(f"   Total messages: {len(messages)}")
-        logger.debug(f"   Summarize interval: [{summarize_start}:{summarize_end}] ({len(to_summarize)} messages)")
-        logger.debug(f"   Preserve interval: [{preserve_start_in_original}:{len(messages)}] ({len(messages)-preserve_start_in_original} messages)")
-        logger.debug(f"   Actual preserved turns: {actual_turns} (target:{self.prefer_recent_turns})")
-        logger.debug(f"   Calling LLM to generate summary...")
-        
-        # 8. Generate summary (no max_tokens limit, let LLM freely generate)
+        logger.debug(
+            "\n📋 [Summarization] Executing:\n"
+            "   Total messages: {0}\n"
+            "   Summarize interval: [{1}:{2}] ({3} messages)\n"
+            "   Preserve interval: [{2}:{0}] ({4} messages)\n"
+            "   Actual preserved turns: {5} (target:{6})\n"
+            "   Calling LLM to generate summary...",
+            len(messages), summarize_start, summarize_end, len(to_summarize),
+            len(messages) - preserve_start_in_original, actual_turns, self.prefer_recent_turns
+        )
+        
+        # 8. Sliding mode: cut the interval from the context, no LLM call
+        if self.mode == "sliding":
+            logger.debug("   Sliding window: truncating instead of summarizing\n")
+            return StrategyResponse(messages=self._insert_marker(
+                messages, self._create_truncate_marker(len(to_summarize)),
+                system_messages, conversation_indices, human_positions, preserve_start_idx
+            ))
+        
+        # 9. Generate summary (no max_tokens limit, let LLM freely generate)
+        if self.background_summarize:
+            # Off the request path: this turn goes out unsummarized
+            if self._pending_summary is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1)
+                self._pending_summary = (
+                    self._executor.submit(self._llm_summarize, to_summarize),
+                    messages[last_marker_idx] if last_marker_idx is not None else None,
+                    messages[preserve_start_in_original],
+                    len(to_summarize),
+                )
+                self._calls_since_summary = 0
+                logger.debug("   Summary submitted to background worker\n")
+            else:
+                logger.debug("   Summary already in progress in background\n")
+            return StrategyResponse(messages=messages)
+        
         summary_text = self._llm_summarize(to_summarize)
         
-        logger.debug(f"   ✅ Summary generated ({len(summary_text)} characters)")
-        logger.debug(f"   Summary preview: {summary_text[:80]}...\n")
+        logger.debug(
+            "   ✅ Summary generated ({} characters)\n   Summary preview: {}...\n",
+            len(summary_text), summary_text[:80]
+        )
+        
+        # 10. Create marker and insert it before preserve interval start
+        marker = self._create_marker(summary_text, len(to_summarize))
+        return StrategyResponse(messages=self._insert_marker(
+            messages, marker, system_messages, conversation_indices, human_positions, preserve_start_idx
+        ))
+    
+    def _insert_marker(
+        self,
+        messages: List[Message],
+        marker: MarkerMessage,
+        system_messages: List[Message],
+        conversation_indices: List[int],
+        human_positions: List[int],
+        preserve_start_idx: int
+    ) -> List[Message]:
+        """
+        Insert marker before the preserve interval and update the classification state.
+        
+        Args:
+            messages: Current message list (not modified)
+            marker: Summary or truncate marker
+            system_messages, conversation_indices, human_positions: Classification of messages
+            preserve_start_idx: Preserve interval start, as index into conversation_indices
+            
+        Returns:
+            New message list with the marker inserted
+        """
+        preserve_start_in_original = conversation_indices[preserve_start_idx]
+        
+        # Build new message list: one copy + in-place insert
+        new_messages = messages.copy()
+        new_messages.insert(preserve_start_in_original, marker)
+        self._calls_since_summary = 0
+        
+        # The new marker is now the last one; preserved messages shift by one
+        self._classify_state = (
+            _snapshot_messages(new_messages),
+            system_messages,
+            preserve_start_in_original,
+            [i + 1 for i in conversation_indices[preserve_start_idx:]],
+            [p - preserve_start_idx for p in human_positions if p >= preserve_start_idx],
+        )
+        
+        return new_messages
+    
+    def _message_tokens(self, messages: List[Message]) -> int:
+        """Sum of per-message tokens (count_messages_tokens without the +2 end marker)."""
+        self._prime_token_cache(messages)
+        return sum(4 + self._content_tokens(m) for m in messages)
+    
+    def _extend_token_state(
+        self,
+        messages: List[Message],
+        system_messages: List[Message],
+        last_marker_idx: Optional[int],
+        conversation_indices: List[int]
+    ) -> Optional[int]:
+        """
+        Update the running token total of the analyzed messages by appended messages.
+        
+        Only valid while the previously counted messages are in place with the
+        same content, the last summary marker has not moved and the token
+        counter is unchanged; otherwise the caller recounts everything.
         
-        # 10. Create marker
-        marker = MarkerMessage(
+        Args:
+            messages: Complete message list
+            system_messages: System messages (from _classify)
+            last_marker_idx: Index of last summary marker (from _classify)
+            conversation_indices: Conversation message indices after the marker (from _classify)
+            
+        Returns:
+            Token count of the analyzed messages, or None if a full count is needed
+        """
+        state = self._token_state
+        if state is None:
+            return None
+        snapshot, prev_marker_idx, counter, system_count, system_tokens, window_tokens = state
+        if (
+            counter is not self.token_counter
+            or prev_marker_idx != last_marker_idx
+            or not _prefix_unchanged(messages, snapshot)
+        ):
+            return None
+        prev_len = len(snapshot[0])
+        
+        system_tokens += self._message_tokens(system_messages[system_count:])
+        if last_marker_idx is not None:
+            # Window is everything from the marker on
+            window_tokens += self._message_tokens(messages[prev_len:])
+        else:
+            # Window is the conversation messages; appended ones are at the end
+            k = len(conversation_indices)
+            while k and conversation_indices[k - 1] >= prev_len:
+                k -= 1
+            window_tokens += self._message_tokens([messages[i] for i in conversation_indices[k:]])
+        
+        self._token_state = (
+            _snapshot_messages(messages), last_marker_idx, counter,
+            len(system_messages), system_tokens, window_tokens
+        )
+        return 2 + system_tokens + window_tokens
+    
+    def _create_marker(self, summary_text: str, summarized_count: int) -> MarkerMessage:
+        """Create the summary marker for summary_text covering summarized_count messages."""
+        return MarkerMessage(
             content=f"[Conversation Summary] {summary_text}",
             metadata={
                 "type": "summary",
-                "summarized_count": len(to_summarize),
+                "summarized_count": summarized_count,
                 "summary": summary_text
             }
         )
-        
-        # 11. Build new message list: insert marker before preserve interval start
-        new_messages = (
-            messages[:preserve_start_in_original] + 
-            [marker] + 
-            messages[preserve_start_in_original:]
+    
+    def _create_truncate_marker(self, truncated_count: int) -> MarkerMessage:
+        """Create the sliding-mode marker cutting truncated_count messages from the context."""
+        return MarkerMessage(
+            content="",
+            metadata={
+                "type": self._marker_type,
+                "truncated_count": truncated_count,
+                "reason": f"sliding window (tokens > {self.trigger_tokens})"
+            }
         )
+    
+    def _apply_pending_summary(self, messages: List[Message]) -> List[Message]:
+        """
+        Insert a finished background summary into the current message list.
+        
+        The marker goes before the first message that was preserved when the
+        job was submitted. If the list has changed underneath (another
+        summary marker appeared, or the preserved message is gone, e.g. after
+        a reset) the result is stale and dropped; the threshold check will
+        trigger a fresh summary if still needed.
         
-        return StrategyResponse(messages=new_messages)
+        Args:
+            messages: Current message list
+            
+        Returns:
+            Message list with the marker inserted, or messages unchanged
+        """
+        future, prev_marker, boundary, summarized_count = self._pending_summary
+        self._pending_summary = None
+        
+        try:
+            summary_text = future.result()
+        except Exception as e:
+            logger.warning("[Summarization] Background summary failed: {}", e)
+            return messages
+        
+        _, last_marker_idx, conversation_indices, _ = self._classify(messages)
+        current_marker = messages[last_marker_idx] if last_marker_idx is not None else None
+        if current_marker is not prev_marker:
+            logger.debug("[Summarization] Background summary is stale, dropped")
+            return messages
+        
+        for i in conversation_indices:
+            if messages[i] is boundary:
+                marker = self._create_marker(summary_text, summarized_count)
+                logger.debug("[Summarization] Background summary inserted at {}", i)
+                new_messages = messages.copy()
+                new_messages.insert(i, marker)
+                return new_messages
+        
+        logger.debug("[Summarization] Background summary is stale, dropped")
+        return messages
     
-    def _find_last_summary_marker(self, messages: List[Message]) -> Optional[int]:
+    def _classify(self, messages: List[Message]) -> Tuple[List[Message], Optional[int], List[int], List[int]]:
         """
-        Find the index of the last summary marker.
+        Classify messages in one forward pass.
+        
+        The result is kept between calls: when the previously classified
+        messages are still in place and unedited (messages were only
+        appended), only the new tail is scanned, so the last marker position is maintained instead of
+        searched for.
         
         Args:
-            messages: Message list
+            messages: Complete message list
             
         Returns:
-            Index of last summary marker, None if not found
+            (system messages, index of last summary (sliding mode: truncate) marker or None,
+             original indices of conversation messages after that marker,
+             positions of HumanMessages within those conversation messages)
         """
-        for i in range(len(messages) - 1, -1, -1):
-            msg = messages[i]
-            if isinstance(msg, MarkerMessage):
-                if msg.metadata.get("type") == "summary":
-                    return i
-        return None
+        state = self._classify_state
+        if state is not None and _prefix_unchanged(messages, state[0]):
+            snapshot, system_messages, last_marker_idx, conversation_indices, human_positions = state
+            start = len(snapshot[0])
+        else:
+            start = 0
+            system_messages = []
+            last_marker_idx = None
+            conversation_indices = []
+            human_positions = []
+        
+        for i in range(start, len(messages)):
+            m = messages[i]
+            role = m.role
+            if role == "system":
+                system_messages.append(m)
+            elif role == "context":
+                if m.metadata.get("type") == self._marker_type:
+                    # Only messages after the last marker of this mode count
+                    last_marker_idx = i
+                    conversation_indices = []
+                    human_positions = []
+            else:
+                if role == "user":
+                    human_positions.append(len(conversation_indices))
+                conversation_indices.append(i)
+        
+        if messages:
+            self._classify_state = (
+                _snapshot_messages(messages), system_messages, last_marker_idx,
+                conversation_indices, human_positions
+            )
+        return system_messages, last_marker_idx, conversation_indices, human_positions
     
     def _find_preserve_start(self, conversation_messages: List[Message]) -> Optional[int]:
         """
@@ -279,9 +768,8 @@ class SummarizationStrategy(BaseContextStrategy):
     
     def _find_preserve_start_adaptive(
         self, 
-        conversation_messages: List[Message],
-        system_messages: List[Message]
-    ) -> tuple[Optional[int], int]:
+        human_positions: List[int]
+    ) -> Tuple[Optional[int], int]:
         """
         Find preserve interval start point, preserving recent prefer_recent_turns turns.
         
@@ -289,57 +777,74 @@ class SummarizationStrategy(BaseContextStrategy):
         Modern model context windows are large enough (128k+), summary length is not a bottleneck.
         
         Args:
-            conversation_messages: Conversation message list (excluding system messages and markers)
-            system_messages: System message list (parameter kept for caller compatibility)
+            human_positions: Positions of HumanMessages in the conversation messages
+                             (excluding system messages and markers), as maintained by _classify
             
         Returns:
             (Preserve interval start index, actual preserved turns), (None, 0) if not found
         """
-        if not conversation_messages:
-            return None, 0
-        
-        # Count back all HumanMessage indices
-        human_indices = []
-        for i in range(len(conversation_messages) - 1, -1, -1):
-            if isinstance(conversation_messages[i], HumanMessage):
-                human_indices.append(i)
-        
-        if len(human_indices) <= 1:
+        if len(human_positions) <= 1:
             # Only 0 or 1 turns, cannot summarize
             return None, 0
         
         # Calculate actual preserved turns
-        turns_to_keep = min(self.prefer_recent_turns, len(human_indices) - 1)
+        turns_to_keep = min(self.prefer_recent_turns, len(human_positions) - 1)
         
         # Preserve interval start is the (turns_to_keep + 1)th HumanMessage from back
-        preserve_start_idx = human_indices[turns_to_keep]
+        preserve_start_idx = human_positions[-(turns_to_keep + 1)]
         
         return preserve_start_idx, turns_to_keep
     
-    def _find_message_index_in_original(
-        self, 
-        original_messages: List[Message], 
-        target_message: Message
-    ) -> int:
+    def _compact_content(self, text: str) -> str:
         """
-        Find target message index in original message list.
+        Compact an older assistant/tool output for the summarizer prompt.
+        
+        Code blocks become one-line descriptors and whatever is still longer
+        than _MAX_PROMPT_TEXT_CHARS keeps only its head and tail. Only the prompt
+        is affected; the messages themselves are never modified.
         
         Args:
-            original_messages: Original message list
-            target_message: Target message
+            text: Stripped message content
             
         Returns:
-            Target message index in original list
+            Compacted text
+        """
+        return _truncate_middle(_CODE_BLOCK_RE.sub(_describe_code_block, text))
+    
+    def _compacted_content(self, msg: Message) -> str:
+        """
+        Compacted stripped content of an older output, memoized on the message.
+        
+        Overlapping windows re-read the same old outputs on every summarization,
+        so the code-block regex pass runs once per message content.
+        
+        Args:
+            msg: Assistant or tool message
             
-        Raises:
-            ContextError: If target message not found
+        Returns:
+            Compacted text
         """
-        for i, msg in enumerate(original_messages):
-            if msg is target_message:
-                return i
-        raise ContextError(f"Target message not found in original message list")
+        cached = msg._compact_cache
+        if cached is not None and cached[0] is msg.content:
+            return cached[1]
+        
+        compacted = self._compact_content(self._stripped_content(msg))
+        msg._compact_cache = (msg.content, compacted)
+        return compacted
+    
+    def _get_provider(self):
+        """Get the summarizer provider on first use and reuse it (and its HTTP client) afterwards."""
+        if self._provider is None:
+            key = self._provider_key()
+            self._provider = _acquire_summarizer_provider(key)
+            # A strategy dropped without close() still releases its reference
+            self._provider_release = weakref.finalize(self, _release_summarizer_provider, key)
+        return self._provider
+    
+    def _provider_key(self) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+        """Key of this strategy's summarizer in the shared provider pool."""
+        return (self._parsed_uri['provider'], tuple(sorted(self._provider_config.items())))
     
-
     def _llm_summarize(self, messages: List[Message]) -> str:
         """
         Generate summary using configured model.
@@ -351,124 +856,50 @@ class SummarizationStrategy(BaseContextStrategy):
             LLM-generated summary text
         """
         # Build prompt from old messages
-        segments: List[str] = []
-        for m in messages:
-            if isinstance(m, HumanMessage):
-                role = "User"
-                text = (m.content or "").strip()
-            elif isinstance(m, AIMessage):
-                role = "Assistant"
-                text = (m.content or "").strip()
-            elif isinstance(m, MarkerMessage):
+        # With progressive_compress, all but the most recent assistant/tool outputs are compacted
+        compact_before = -1
+        if self.progressive_compress:
+            output_positions = [i for i, m in enumerate(messages) if m.role in ("assistant", "tool")]
+            if len(output_positions) > self._RECENT_VERBATIM_OUTPUTS:
+                compact_before = output_positions[-self._RECENT_VERBATIM_OUTPUTS]
+        
+        buf = io.StringIO()
+        for i, m in enumerate(messages):
+            if m.role == "context":
                 # For marker, extract pure summary content from metadata, not content (content has "[Conversation Summary]" prefix)
                 role = "Previous Summary"
                 text = m.metadata.get('summary', '').strip()
             else:
-                role = "Message"
-                text = (m.content or "").strip()
+                # Stripped content is memoized on the message: history is re-read on every trigger
+                role = _SEGMENT_LABELS.get(m.role, "Message")
+                text = self._stripped_content(m)
+            
+            if i < compact_before and m.role in ("assistant", "tool"):
+                text = self._compacted_content(m)
             
             if text:
-                segments.append(f"{role}: {text}")
+                if buf.tell():
+                    buf.write("\n")
+                buf.write(role)
+                buf.write(": ")
+                buf.write(text)
         
-        prompt = "\n".join(segments)
+        prompt = buf.getvalue()
         if not prompt:
             raise ContextError("No valid content to summarize")
         
-        # Parse URI to get provider config
-        parsed = parse_uri(self.summarizer_model_uri)
-        
-        # Build config dict
-        config_dict = {
-            'api_key': self.summarizer_api_key,
-            'model': parsed['model']
-        }
-        if parsed['base_url']:
-            config_dict['base_url'] = parsed['base_url']
-        
-        # Create provider using Chak's provider system
-        provider = create_provider(
-            parsed['provider'],
-            config_dict,
-            category=ProviderCategory.LLM
-        )
+        # Identical history (retries, replays) was already summarized: reuse it
+        cache_key = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            self._summary_cache.move_to_end(cache_key)
+            logger.debug("   Summary reused from cache")
+            return cached
+        
+        provider = self._get_provider()
         
-        # Build summarization prompt with few-shot examples
-        system_inst = (
-            "You are a conversation summarizer. Your task is to create a CUMULATIVE summary "  
-            "that preserves all previous rounds and adds new round information.\n\n"
-            "## Output Structure (MANDATORY)\n\n"
-            "[Summary]\n"
-            "Each round should have:\n"
-            "  - Topic: <what this round discussed>\n"
-            "  - User Intent: <what user wanted in this round>\n"
-            "  - Summary: <CONCISE summary of key points - 3-5 bullet points max>\n\n"
-            "---\n\n"
-            "## CRITICAL RULES\n\n"
-            "### Rule 1: Previous Rounds Must Be Copied Exactly\n"
-            "If there is 'Previous Summary' in the input:\n"
-            "  1. Copy ALL previous rounds COMPLETELY (word-by-word)\n"
-            "  2. Then APPEND new round information at the end\n"
-            "  3. DO NOT shorten, compress, or rewrite previous rounds\n"
-            "  4. Think: New Summary = All Previous Rounds (unchanged) + New Round\n\n"
-            "### Rule 2: New Round Must Be CONCISE Summary\n"
-            "For the NEW round you are creating:\n"
-            "  - Extract ONLY the most important 3-5 key points\n"
-            "  - Each bullet point: 1-2 sentences maximum\n"
-            "  - Remove examples, detailed explanations, tables, formulas\n"
-            "  - Focus on: core concepts, main conclusions, key differences\n"
-            "  - DO NOT copy-paste full paragraphs from Assistant's response\n\n"
-            "Think: If someone reads only your summary, they should understand the essence.\n\n"
-            "---\n\n"
-            "## Example 1: First Summary (No Previous Summary)\n\n"
-            "Input:\n"
-            "  User: Tell me about AI history\n"
-            "  Assistant: [3000 words detailed response about AI history...]\n\n"
-            "Output:\n"
-            "[Summary]\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "📌 ROUND 1\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "Topic: Artificial Intelligence History\n"
-            "User Intent: Learning AI development timeline\n\n"
-            "Summary:\n"
-            "- AI evolved through 6 stages: 1940s embryonic period, 1956 birth at Dartmouth, 1970s first winter, 1980s expert systems, 1990s second winter, 2000s+ modern rise\n"
-            "- Key milestones: 1950 Turing Test, 2006 deep learning concept, 2012 ImageNet breakthrough, 2016 AlphaGo victory\n"
-            "- Current era driven by big data, GPU computing, and breakthrough algorithms (GPT, BERT, etc.)\n\n"
-            "---\n\n"
-            "## Example 2: Second Summary (Has Previous Summary)\n\n"
-            "Input:\n"
-            "  Previous Summary: [Summary with Round 1...]\n"
-            "  User: What's the difference between ML and DL?\n"
-            "  Assistant: [2000 words with definitions, tables, examples...]\n\n"
-            "Output:\n"
-            "[Summary]\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "📌 ROUND 1 (COPIED FROM PREVIOUS SUMMARY)\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "Topic: Artificial Intelligence History\n"
-            "User Intent: Learning AI development timeline\n\n"
-            "Summary:\n"
-            "- AI evolved through 6 stages: 1940s embryonic period, 1956 birth at Dartmouth, 1970s first winter, 1980s expert systems, 1990s second winter, 2000s+ modern rise\n"
-            "- Key milestones: 1950 Turing Test, 2006 deep learning concept, 2012 ImageNet breakthrough, 2016 AlphaGo victory\n"
-            "- Current era driven by big data, GPU computing, and breakthrough algorithms (GPT, BERT, etc.)\n\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "📌 ROUND 2 (NEW CONTENT)\n"
-            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            "Topic: Machine Learning vs Deep Learning\n"
-            "User Intent: Understanding core differences between ML and DL\n\n"
-            "Summary:\n"
-            "- Relationship: DL is a subset of ML\n"
-            "- Key differences: ML needs manual feature engineering, DL learns features automatically; ML works with small data, DL needs large datasets and GPUs\n"
-            "- ML is more interpretable (e.g., decision trees), DL is 'black box' but powerful for images/speech/text\n\n"
-            "---\n\n"
-            "## Key Points\n"
-            "- Each round has its own Topic + User Intent + Summary\n"
-            "- Previous rounds: copy exactly (word-by-word)\n"
-            "- NEW round: extract 3-5 key points ONLY (concise summary, not full content)\n"
-            "- Use the SAME LANGUAGE as input messages\n"
-        )
         summarize_messages = [
-            SystemMessage(content=system_inst),
+            self._system_message,
             HumanMessage(content=prompt)
         ]
         
@@ -480,9 +911,13 @@ class SummarizationStrategy(BaseContextStrategy):
         )
         
         # Extract content
-        if isinstance(response, AIMessage):
-            if response.content:
-                return response.content.strip()
-            raise ContextError("Summarizer model returned empty response")
-        else:
+        if not isinstance(response, AIMessage):
             raise ContextError(f"Unexpected response type: {type(response)}")
+        summary = response.content.strip() if response.content else ""
+        if not summary:
+            raise ContextError("Summarizer model returned empty response")
+        
+        self._summary_cache[cache_key] = summary
+        if len(self._summary_cache) > self._SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+        return summary
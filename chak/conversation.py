@@ -1,9 +1,13 @@
 import asyncio
-from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Union, Optional, AsyncIterator
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Mapping, Union, Optional, AsyncIterator
 
 from .context.strategies import BaseContextStrategy, NoopStrategy
-from .context.strategies.base import StrategyRequest
-from .message import Message, MessageChunk, HumanMessage, AIMessage, SystemMessage, ToolMessage, MarkerMessage
+from .context.strategies.base import StrategyRequest, StrategyResponse, _prefix_unchanged, _snapshot_messages
+from .message import (
+    BaseMessage, Message, MessageChunk, HumanMessage, AIMessage, SystemMessage, ToolMessage, MarkerMessage
+)
 from .providers import create_provider
 from .providers.types import ProviderCategory
 from .utils.uri import parse as parse_uri
@@ -13,6 +17,29 @@ if TYPE_CHECKING:
     from .mcp.manager import ToolManager
 
 
+# Message class for each dict role accepted by add_messages ("context" is handled separately)
+_ROLE_TO_CLS = {
+    "user": HumanMessage,
+    "assistant": AIMessage,
+    "system": SystemMessage,
+    "tool": ToolMessage,
+}
+
+
+@lru_cache(maxsize=256)
+def _parse_model_uri(model_uri: str) -> Mapping[str, Any]:
+    """
+    Parse a model URI once per distinct URI.
+    
+    Apps that create many short-lived Conversations for the same model skip
+    re-parsing. The result is shared between callers, so it is returned as
+    read-only views (including the query params).
+    """
+    parsed = parse_uri(model_uri)
+    parsed['params'] = MappingProxyType(parsed['params'])
+    return MappingProxyType(parsed)
+
+
 class Conversation:
     """
     Chat conversation that follows your desired flow:
@@ -77,6 +104,14 @@ class Conversation:
         self.messages = []
         self.tools = tools
         
+        # Classification of self.messages from the last send:
+        # (message snapshot, system messages, non-system messages, last marker index)
+        self._extract_state: Optional[tuple] = None
+        
+        # Running stats() totals of self.messages:
+        # (message snapshot, by_type, total tokens, input tokens, output tokens)
+        self._stats_state: Optional[tuple] = None
+        
         # Initialize tool manager if tools provided
         self._tool_manager: Optional["ToolManager"] = None
         if tools:
@@ -92,7 +127,7 @@ class Conversation:
         self.context_strategy = context_strategy or NoopStrategy()
 
         # 1. Parse URI to dict
-        parsed = parse_uri(model_uri)
+        parsed = _parse_model_uri(model_uri)
 
         # 2. Build config dict (URI params + kwargs + model)
         config_dict = self._build_config_dict(parsed, kwargs)
@@ -122,25 +157,20 @@ class Conversation:
         
         return SystemMessage(content=system_message)
     
-    def _build_config_dict(self, parsed_uri: Dict, kwargs: Dict) -> Dict[str, Any]:
+    def _build_config_dict(self, parsed_uri: Mapping[str, Any], kwargs: Dict) -> Dict[str, Any]:
         """Build configuration dictionary from URI and kwargs."""
-        config_dict = {}
-
-        # Core config from URI
-        config_dict['api_key'] = self.api_key
-        config_dict['model'] = parsed_uri['model']
-
-        # Add base_url from URI if present
-        if parsed_uri['base_url']:
-            config_dict['base_url'] = parsed_uri['base_url']
-
-        # Add parameters from URI query string
-        config_dict.update(parsed_uri['params'])
-
-        # Add/override with kwargs (kwargs have higher priority)
-        config_dict.update(kwargs)
-
-        return config_dict
+        base_url = parsed_uri['base_url']
+        return {
+            # Core config from URI
+            'api_key': self.api_key,
+            'model': parsed_uri['model'],
+            # base_url from URI if present
+            **({'base_url': base_url} if base_url else {}),
+            # Parameters from URI query string
+            **parsed_uri['params'],
+            # Add/override with kwargs (kwargs have higher priority)
+            **kwargs,
+        }
 
     def add_messages(self, messages: List[Union[Message, Dict[str, str]]]) -> None:
         """
@@ -165,23 +195,18 @@ class Conversation:
                 role = msg['role']
                 content = msg.get('content')
                 
-                if role == "user":
-                    self.messages.append(HumanMessage(content=content))
-                elif role == "assistant":
-                    self.messages.append(AIMessage(content=content))
-                elif role == "system":
-                    self.messages.append(SystemMessage(content=content))
-                elif role == "tool":
-                    self.messages.append(ToolMessage(content=content))
-                elif role == "context":
+                if role == "context":
                     metadata = msg.get('metadata', {})
                     if isinstance(metadata, dict):
                         self.messages.append(MarkerMessage(content=content, metadata=metadata))
                     else:
                         self.messages.append(MarkerMessage(content=content))
                 else:
-                    raise ValueError(f"Invalid role: {role}")
-            elif isinstance(msg, (HumanMessage, AIMessage, SystemMessage, ToolMessage, MarkerMessage)):
+                    message_cls = _ROLE_TO_CLS.get(role)
+                    if message_cls is None:
+                        raise ValueError(f"Invalid role: {role}")
+                    self.messages.append(message_cls(content=content))
+            elif isinstance(msg, BaseMessage):
                 # Already a Message object, add directly
                 self.messages.append(msg)
             else:
@@ -191,6 +216,7 @@ class Conversation:
             self,
             message: Union[str, Message],
             stream: bool = False,
+            coalesce_chars: int = 0,
             **kwargs
     ) -> Union[Message, Iterator[MessageChunk]]:
         """
@@ -206,6 +232,8 @@ class Conversation:
         Args:
             message: Message content (str will be converted to HumanMessage)
             stream: Enable streaming
+            coalesce_chars: When streaming, merge consecutive content chunks until at least
+                            this many characters are buffered (0 = yield every chunk)
             **kwargs: Additional LLM parameters
         
         Returns:
@@ -258,7 +286,7 @@ class Conversation:
 
         # Normal LLM call (no tools)
         if stream:
-            return self._send_stream(messages_to_send, **kwargs)
+            return self._send_stream(messages_to_send, coalesce_chars=coalesce_chars, **kwargs)
         else:
             response = self.provider.send(
                 messages=messages_to_send,
@@ -266,7 +294,7 @@ class Conversation:
                 **kwargs
             )
             # Response is Message (not Iterator)
-            if not isinstance(response, (HumanMessage, AIMessage, SystemMessage, ToolMessage, MarkerMessage)):
+            if not isinstance(response, BaseMessage):
                 # Old Message type, convert to AIMessage
                 ai_response = AIMessage(
                     content=response.content,  # type: ignore
@@ -283,6 +311,7 @@ class Conversation:
             self,
             message: Union[str, Message],
             stream: bool = False,
+            coalesce_chars: int = 0,
             **kwargs
     ) -> Union[Message, AsyncIterator[MessageChunk]]:
         """
@@ -296,6 +325,8 @@ class Conversation:
         Args:
             message: Message content (str will be converted to HumanMessage)
             stream: Enable streaming
+            coalesce_chars: When streaming, merge consecutive content chunks until at least
+                            this many characters are buffered (0 = yield every chunk)
             **kwargs: Additional LLM parameters
         
         Returns:
@@ -331,8 +362,8 @@ class Conversation:
         
         self.messages.append(user_message)
 
-        # Apply context strategy
-        messages_to_send = self._apply_context_strategy()
+        # Apply context strategy (summarizer calls run off the event loop)
+        messages_to_send = await self._aapply_context_strategy()
 
         # Check if tools are configured
         if self._tool_manager:
@@ -344,11 +375,16 @@ class Conversation:
         else:
             # Normal LLM mode
             if stream:
-                return self._asend_stream(messages_to_send, **kwargs)
+                return self._asend_stream(messages_to_send, coalesce_chars=coalesce_chars, **kwargs)
             else:
                 return await self._asend_nonstream(messages_to_send, **kwargs)
     
-    async def _asend_stream(self, messages: List[Message], **kwargs) -> AsyncIterator[MessageChunk]:
+    async def _asend_stream(
+            self,
+            messages: List[Message],
+            coalesce_chars: int = 0,
+            **kwargs
+    ) -> AsyncIterator[MessageChunk]:
         """Handle async streaming response."""
         # Get provider chunks (sync iterator)
         def _get_sync_chunks():
@@ -361,19 +397,21 @@ class Conversation:
         # Run in thread to avoid blocking
         provider_chunks = await asyncio.to_thread(_get_sync_chunks)
 
-        # Convert to standard chunks and collect content
-        complete_content = ""
+        # Convert to standard chunks and collect content (joined once at the end)
+        content_parts: List[str] = []
         last_chunk_was_final = False
         
-        for provider_chunk in provider_chunks:
-            chunk = self.provider.converter.from_provider_chunk(provider_chunk)
-            complete_content += chunk.content
+        chunks = (self.provider.converter.from_provider_chunk(c) for c in provider_chunks)
+        for chunk in self._coalesce_chunks(chunks, coalesce_chars):
+            content_parts.append(chunk.content)
             
             # Check if this chunk is already marked as final
             if chunk.is_final:
                 last_chunk_was_final = True
             
             yield chunk
+        
+        complete_content = "".join(content_parts)
 
         # Only send additional final chunk if provider didn't send one
         if complete_content and not last_chunk_was_final:
@@ -400,7 +438,7 @@ class Conversation:
         if not self._tool_manager:
             raise RuntimeError("Tool manager not initialized")
         
-        complete_content = ""
+        content_parts: List[str] = []
         
         # Use tool manager's streaming loop
         async for chunk in self._tool_manager.execute_loop_stream(
@@ -408,9 +446,11 @@ class Conversation:
             messages=messages,
             model_uri=self.model_uri
         ):
-            complete_content += chunk.content
+            content_parts.append(chunk.content)
             yield chunk
         
+        complete_content = "".join(content_parts)
+        
         # Save final message
         if complete_content:
             final_message = AIMessage(content=complete_content)
@@ -439,7 +479,7 @@ class Conversation:
             **kwargs
         )
         # Convert to AIMessage
-        if not isinstance(response, (HumanMessage, AIMessage, SystemMessage, ToolMessage, MarkerMessage)):
+        if not isinstance(response, BaseMessage):
             ai_response = AIMessage(
                 content=response.content,  # type: ignore
                 reasoning_content=response.reasoning_content,  # type: ignore
@@ -451,7 +491,12 @@ class Conversation:
         self.messages.append(ai_response)
         return ai_response
 
-    def _send_stream(self, messages: List[Message], **kwargs) -> Iterator[MessageChunk]:
+    def _send_stream(
+            self,
+            messages: List[Message],
+            coalesce_chars: int = 0,
+            **kwargs
+    ) -> Iterator[MessageChunk]:
         """Handle streaming response."""
         # Get provider chunks (model is already in provider config)
         provider_chunks = self.provider.send(
@@ -460,19 +505,21 @@ class Conversation:
             **kwargs
         )
 
-        # Convert to standard chunks and collect content
-        complete_content = ""
+        # Convert to standard chunks and collect content (joined once at the end)
+        content_parts: List[str] = []
         last_chunk_was_final = False
         
-        for provider_chunk in provider_chunks:
-            chunk = self.provider.converter.from_provider_chunk(provider_chunk)
-            complete_content += chunk.content
+        chunks = (self.provider.converter.from_provider_chunk(c) for c in provider_chunks)
+        for chunk in self._coalesce_chunks(chunks, coalesce_chars):
+            content_parts.append(chunk.content)
             
             # Check if this chunk is already marked as final
             if chunk.is_final:
                 last_chunk_was_final = True
             
             yield chunk
+        
+        complete_content = "".join(content_parts)
 
         # Only send additional final chunk if provider didn't send one
         if complete_content and not last_chunk_was_final:
@@ -494,6 +541,43 @@ class Conversation:
             )
             self.messages.append(final_message)
 
+    @staticmethod
+    def _coalesce_chunks(chunks: Iterator[MessageChunk], coalesce_chars: int) -> Iterator[MessageChunk]:
+        """
+        Merge consecutive content chunks into chunks of at least coalesce_chars characters.
+        
+        A merged chunk carries the metadata of the last chunk merged into it.
+        The final chunk (is_final or final_message) flushes the buffer and is
+        passed through unchanged, so the final-chunk contract holds. With
+        coalesce_chars <= 0 every chunk is yielded as-is.
+        """
+        if coalesce_chars <= 0:
+            yield from chunks
+            return
+        
+        buffer: List[str] = []
+        buffered = 0
+        metadata = None
+        for chunk in chunks:
+            if chunk.is_final or chunk.final_message is not None:
+                if buffer:
+                    yield MessageChunk(content="".join(buffer), metadata=metadata)
+                    buffer.clear()
+                    buffered = 0
+                yield chunk
+                continue
+            
+            buffer.append(chunk.content)
+            buffered += len(chunk.content)
+            metadata = chunk.metadata
+            if buffered >= coalesce_chars:
+                yield MessageChunk(content="".join(buffer), metadata=metadata)
+                buffer.clear()
+                buffered = 0
+        
+        if buffer:
+            yield MessageChunk(content="".join(buffer), metadata=metadata)
+    
     def _apply_context_strategy(self) -> List[Message]:
         """
         Apply context strategy to process messages.
@@ -504,14 +588,41 @@ class Conversation:
         if not self.messages:
             return []
         
+        # Pass-through strategy: nothing to ask it, use the history as-is
+        if type(self.context_strategy) is NoopStrategy:
+            return self._prepare_for_llm(self._extract_messages_to_send(self.messages))
+        
         # Build strategy request
         request = StrategyRequest(messages=self.messages)
         
         # Get strategy response
         response = self.context_strategy.process(request)
         
-        # Update messages (may include markers)
-        self.messages = response.messages
+        return self._use_strategy_response(response)
+    
+    async def _aapply_context_strategy(self) -> List[Message]:
+        """
+        Async version of _apply_context_strategy, using the strategy's aprocess().
+        
+        Returns:
+            Complete processed message list (strategy may insert markers)
+        """
+        if not self.messages:
+            return []
+        
+        if type(self.context_strategy) is NoopStrategy:
+            return self._prepare_for_llm(self._extract_messages_to_send(self.messages))
+        
+        request = StrategyRequest(messages=self.messages)
+        response = await self.context_strategy.aprocess(request)
+        
+        return self._use_strategy_response(response)
+    
+    def _use_strategy_response(self, response: StrategyResponse) -> List[Message]:
+        """Store the strategy's message list and build the messages to send."""
+        # Update messages (may include markers); strategies that change nothing return the same list
+        if response.messages is not self.messages:
+            self.messages = response.messages
         
         # Extract messages to send: system messages + last marker (inclusive) → end
         messages_to_send = self._extract_messages_to_send(response.messages)
@@ -539,15 +650,26 @@ class Conversation:
         if not messages:
             return []
         
-        # 1. Extract system messages
-        system_messages = [m for m in messages if isinstance(m, SystemMessage)]
-        
-        # 2. Find last marker
-        last_marker_idx = None
-        for i in range(len(messages) - 1, -1, -1):
-            if isinstance(messages[i], MarkerMessage):
-                last_marker_idx = i
-                break
+        # 1-2. Single pass: system messages, non-system messages, last marker
+        #      Only messages appended since the last call are scanned while the
+        #      earlier ones are the same objects with the same content
+        state = self._extract_state
+        if state is not None and _prefix_unchanged(messages, state[0]):
+            snapshot, system_messages, conversation_messages, last_marker_idx = state
+            start = len(snapshot[0])
+        else:
+            start, system_messages, conversation_messages, last_marker_idx = 0, [], [], None
+        for i in range(start, len(messages)):
+            m = messages[i]
+            if isinstance(m, SystemMessage):
+                system_messages.append(m)
+            else:
+                if isinstance(m, MarkerMessage):
+                    last_marker_idx = i
+                conversation_messages.append(m)
+        self._extract_state = (
+            _snapshot_messages(messages), system_messages, conversation_messages, last_marker_idx
+        )
         
         # 3. Extract messages based on marker presence
         if last_marker_idx is not None:
@@ -555,36 +677,35 @@ class Conversation:
             context_messages = messages[last_marker_idx:]
         else:
             # No marker: all non-system messages
-            context_messages = [
-                m for m in messages 
-                if not isinstance(m, SystemMessage)
-            ]
+            context_messages = conversation_messages
         
-        # 4. Combine: system messages + context messages
-        return list(system_messages) + list(context_messages)
+        # 4. Combine: system messages + context messages (both already lists; one new list)
+        return system_messages + context_messages
     
     def _prepare_for_llm(self, messages: List[Message]) -> List[Message]:
         """
         Prepare messages for LLM by converting MarkerMessage to SystemMessage.
         
+        Converts in place: the list is the fresh one built by
+        _extract_messages_to_send, so no third copy of the context is made.
+        
         Args:
-            messages: Messages to send
+            messages: Messages to send (modified in place)
             
         Returns:
             Messages with context role converted to system
         """
-        result: List[Message] = []
-        for msg in messages:
+        for i, msg in enumerate(messages):
             if isinstance(msg, MarkerMessage):
                 # Convert to SystemMessage for LLM compatibility
-                result.append(SystemMessage(content=msg.content))
-            else:
-                result.append(msg)
-        return result
+                messages[i] = SystemMessage(content=msg.content)
+        return messages
 
     def clear(self):
         """Clear conversation history."""
         self.messages.clear()
+        self._extract_state = None
+        self._stats_state = None
     
     def reset(self):
         """
@@ -606,6 +727,8 @@ class Conversation:
             >>> len(conv.messages)  # 1 (only system message)
         """
         self.messages.clear()
+        self._extract_state = None
+        self._stats_state = None
         if self._initial_system_message:
             self.messages.append(self._initial_system_message)
         
@@ -640,33 +763,42 @@ class Conversation:
                 'output_tokens': '4.3K'
             }
         """
-        stats = {
-            'total_messages': len(self.messages),
-            'by_type': {},
-            'total_tokens': 0,
-            'input_tokens': 0,
-            'output_tokens': 0
-        }
+        messages = self.messages
+        
+        # Totals from the last call stay valid while its messages are unchanged
+        # (same check as _extract_messages_to_send) and only appended to
+        state = self._stats_state
+        if state is not None and _prefix_unchanged(messages, state[0]):
+            snapshot, by_type, total_tokens, input_tokens, output_tokens = state
+            start = len(snapshot[0])
+        else:
+            start, by_type, total_tokens, input_tokens, output_tokens = 0, {}, 0, 0, 0
         
         # Count messages by type
-        for msg in self.messages:
+        for i in range(start, len(messages)):
+            msg = messages[i]
             msg_type = msg.role
-            stats['by_type'][msg_type] = stats['by_type'].get(msg_type, 0) + 1
+            by_type[msg_type] = by_type.get(msg_type, 0) + 1
             
             # Count tokens (from metadata)
-            if 'usage' in msg.metadata:
-                usage = msg.metadata['usage']
-                if isinstance(usage, dict):
-                    stats['total_tokens'] += usage.get('total_tokens', 0)
-                    stats['input_tokens'] += usage.get('prompt_tokens', 0) or usage.get('input_tokens', 0)
-                    stats['output_tokens'] += usage.get('completion_tokens', 0) or usage.get('output_tokens', 0)
+            usage = msg.metadata.get('usage')
+            if isinstance(usage, dict):
+                total_tokens += usage.get('total_tokens', 0)
+                input_tokens += usage.get('prompt_tokens', 0) or usage.get('input_tokens', 0)
+                output_tokens += usage.get('completion_tokens', 0) or usage.get('output_tokens', 0)
+        
+        self._stats_state = (
+            _snapshot_messages(messages), by_type, total_tokens, input_tokens, output_tokens
+        )
         
         # Format token counts (use K for numbers over 1000)
-        stats['total_tokens'] = self._format_tokens(stats['total_tokens'])
-        stats['input_tokens'] = self._format_tokens(stats['input_tokens'])
-        stats['output_tokens'] = self._format_tokens(stats['output_tokens'])
-        
-        return stats
+        return {
+            'total_messages': len(messages),
+            'by_type': dict(by_type),
+            'total_tokens': self._format_tokens(total_tokens),
+            'input_tokens': self._format_tokens(input_tokens),
+            'output_tokens': self._format_tokens(output_tokens)
+        }
     
     def _format_tokens(self, tokens: int) -> str:
         """
@@ -683,9 +815,14 @@ class Conversation:
         return str(tokens)
 
     def close(self):
-        """Close the provider."""
+        """Close the provider and release context strategy resources."""
         if hasattr(self, 'provider'):
             self.provider.close()
+        
+        # Some strategies (like SummarizationStrategy) hold a background worker
+        strategy = getattr(self, 'context_strategy', None)
+        if hasattr(strategy, 'close') and callable(getattr(strategy, 'close')):
+            strategy.close()  # type: ignore
 
     def __enter__(self):
         return self
@@ -21,7 +21,9 @@ Provides three usage patterns:
    )
 """
 
-from typing import List
+import asyncio
+import inspect
+from typing import Awaitable, List, Union
 
 from .server import Server
 from .tool import Tool
@@ -29,15 +31,18 @@ from .tool import Tool
 __all__ = ["Server", "Tool", "tools"]
 
 
-async def tools(*tool_lists: List[Tool]) -> List[Tool]:
+async def tools(*tool_lists: Union[List[Tool], Awaitable[List[Tool]]]) -> List[Tool]:
     """
     语法糖：优雅地组合多个工具列表
     
     这是一个简单的辅助函数，用于优雅地组合来自多个服务器的工具。
     本质上就是合并多个 List[Tool]。
     
+    传入未 await 的 Server(...).tools(...) 时，各服务器的工具发现并发进行
+    （asyncio.gather），总耗时约为最慢的一个，而不是逐个相加。
+    
     Args:
-        *tool_lists: 可变数量的工具列表
+        *tool_lists: 可变数量的工具列表，或返回工具列表的 awaitable
     
     Returns:
         List[Tool]: 合并后的工具列表
@@ -53,7 +58,15 @@ async def tools(*tool_lists: List[Tool]) -> List[Tool]:
         tools = await Server(url="...").tools(["maps_*"]) + \
                 await Server(command="python").tools(["add"])
     """
+    # 并发等待所有 awaitable，结果按原位置放回，保持顺序
+    pending = [i for i, tool_list in enumerate(tool_lists) if inspect.isawaitable(tool_list)]
+    resolved = list(tool_lists)
+    if pending:
+        fetched = await asyncio.gather(*(tool_lists[i] for i in pending))
+        for i, tool_list in zip(pending, fetched):
+            resolved[i] = tool_list
+    
     result = []
-    for tool_list in tool_lists:
+    for tool_list in resolved:
         result.extend(tool_list)
     return result
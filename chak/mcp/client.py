@@ -6,7 +6,8 @@ MCPClient 类：统一的 MCP 客户端
 
 import os
 import re
-from typing import TYPE_CHECKING, Any, Dict, List
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 # MCP Python SDK 导入
 try:
@@ -23,6 +24,15 @@ if TYPE_CHECKING:
     from .server import Server
 
 
+# 环境变量引用：${VAR_NAME}（模块加载时编译一次）
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
+
+def _replace_env_var(match: "re.Match") -> str:
+    """${VAR_NAME} → 环境变量值；未设置时保留原文"""
+    return os.environ.get(match.group(1), match.group(0))
+
+
 class MCPClient:
     """
     统一的 MCP 客户端
@@ -33,7 +43,14 @@ class MCPClient:
     - 线程安全
     
     注意：MCP SDK 使用上下文管理器，不适合长期连接复用。
-    每次 list_tools() 或 call_tool() 都会创建新连接。
+    默认每次 list_tools() 或 call_tool() 都会创建新连接。
+    
+    可选：作为异步上下文管理器使用时，在 async with 块内复用同一个会话
+    （只握手/启动进程一次），退出时关闭：
+    
+        async with MCPClient(server) as client:
+            tools = await client.list_tools()
+            result = await client.call_tool("name", {...})
     """
     
     def __init__(self, server: "Server"):
@@ -44,6 +61,61 @@ class MCPClient:
         self.server = server
         self.config = server.get_config()
         self.transport_type = self._detect_transport()
+        # 传输类型在构造后不变：一次性绑定对应的传输创建方法，调用时无需再分支
+        self._open_transport = {
+            "stdio": self._open_stdio,
+            "sse": self._open_sse,
+            "streamable-http": self._open_http,
+        }[self.transport_type]
+        # 已展开环境变量的配置项（env/headers），首次使用时展开，之后复用
+        self._expanded: Dict[str, Any] = {}
+        # async with 期间复用的会话及其上下文栈
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._session: Optional[ClientSession] = None
+    
+    async def __aenter__(self) -> "MCPClient":
+        """建立持久会话（传输连接 + initialize），块内所有调用复用"""
+        stack = AsyncExitStack()
+        try:
+            streams = await stack.enter_async_context(self._open_transport())
+            session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+            await session.initialize()
+        except BaseException:
+            await stack.aclose()
+            raise
+        self._exit_stack = stack
+        self._session = session
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """关闭持久会话，之后恢复为每次调用新建连接"""
+        stack = self._exit_stack
+        self._exit_stack = None
+        self._session = None
+        if stack is not None:
+            await stack.aclose()
+    
+    def _open_stdio(self):
+        """创建 stdio 传输上下文管理器（进入后得到 read/write 流）"""
+        return stdio_client(StdioServerParameters(
+            command=self.config["command"],
+            args=self.config.get("args", []),
+            env=self._expanded_config("env")
+        ))
+    
+    def _open_sse(self):
+        """创建 SSE 传输上下文管理器（进入后得到 read/write 流）"""
+        url = self.config.get("url") or self.config.get("baseUrl")
+        if not url:
+            raise ValueError("SSE transport requires 'url' or 'baseUrl'")
+        return sse_client(url, headers=self._expanded_config("headers", {}))
+    
+    def _open_http(self):
+        """创建 Streamable HTTP 传输上下文管理器（进入后得到 read/write/get_session_id）"""
+        url = self.config.get("url") or self.config.get("baseUrl")
+        if not url:
+            raise ValueError("HTTP transport requires 'url' or 'baseUrl'")
+        return streamablehttp_client(url)
     
     def _detect_transport(self) -> str:
         """
@@ -85,65 +157,28 @@ class MCPClient:
         Returns:
             List[mcp.types.Tool]: 工具列表
         """
-        if self.transport_type == "stdio":
-            return await self._list_tools_stdio()
-        elif self.transport_type == "sse":
-            return await self._list_tools_sse()
-        elif self.transport_type == "streamable-http":
-            return await self._list_tools_http()
-        else:
-            raise NotImplementedError(f"Transport type {self.transport_type} not yet supported")
-    
-    async def _list_tools_stdio(self) -> List[Any]:
-        """通过 stdio 列出工具"""
-        command = self.config["command"]
-        args = self.config.get("args", [])
-        env = self.config.get("env")
+        if self._session is not None:
+            result = await self._session.list_tools()
+            return result.tools
         
-        if env:
-            env = self._expand_env_vars(env)
-        
-        server_params = StdioServerParameters(
-            command=command,
-            args=args,
-            env=env
-        )
-        
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
+        # 未在 async with 中：新建连接，用完即关
+        async with self._open_transport() as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
                 await session.initialize()
                 result = await session.list_tools()
                 return result.tools
     
-    async def _list_tools_sse(self) -> List[Any]:
-        """通过 SSE 列出工具"""
-        url = self.config.get("url") or self.config.get("baseUrl")
-        if not url:
-            raise ValueError("SSE transport requires 'url' or 'baseUrl'")
-        
-        headers = self.config.get("headers", {})
-        headers = self._expand_env_vars(headers)
-        
-        async with sse_client(url, headers=headers) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.list_tools()
-                return result.tools
-    
-    async def _list_tools_http(self) -> List[Any]:
-        """通过 Streamable HTTP 列出工具"""
-        url = self.config.get("url") or self.config.get("baseUrl")
-        if not url:
-            raise ValueError("HTTP transport requires 'url' or 'baseUrl'")
-        
-        headers = self.config.get("headers", {})
-        headers = self._expand_env_vars(headers)
+    def _expanded_config(self, key: str, default: Any = None) -> Any:
+        """
+        获取展开环境变量后的配置项
         
-        async with streamablehttp_client(url) as (read, write, _):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.list_tools()
-                return result.tools
+        config 在构造后不再变化，每个 key 只递归展开一次，
+        后续 list_tools()/call_tool() 直接复用结果。
+        """
+        if key not in self._expanded:
+            value = self.config.get(key, default)
+            self._expanded[key] = self._expand_env_vars(value) if value else value
+        return self._expanded[key]
     
     def _expand_env_vars(self, obj: Any) -> Any:
         """
@@ -155,12 +190,11 @@ class MCPClient:
             "Bearer ${DASHSCOPE_API_KEY}" → "Bearer sk-xxx"
         """
         if isinstance(obj, str):
+            # 不含 ${ 的字符串无需进入正则
+            if '${' not in obj:
+                return obj
             # 替换 ${VAR_NAME}
-            def replace_var(match):
-                var_name = match.group(1)
-                return os.environ.get(var_name, match.group(0))
-            
-            return re.sub(r'\$\{([^}]+)\}', replace_var, obj)
+            return _ENV_VAR_RE.sub(_replace_env_var, obj)
         
         elif isinstance(obj, dict):
             return {k: self._expand_env_vars(v) for k, v in obj.items()}
@@ -182,65 +216,14 @@ class MCPClient:
         Returns:
             工具执行结果
         """
-        if self.transport_type == "stdio":
-            return await self._call_tool_stdio(tool_name, arguments)
-        elif self.transport_type == "sse":
-            return await self._call_tool_sse(tool_name, arguments)
-        elif self.transport_type == "streamable-http":
-            return await self._call_tool_http(tool_name, arguments)
-        else:
-            raise NotImplementedError(f"Transport type {self.transport_type} not yet supported")
-    
-    async def _call_tool_stdio(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """通过 stdio 调用工具"""
-        command = self.config["command"]
-        args = self.config.get("args", [])
-        env = self.config.get("env")
-        
-        if env:
-            env = self._expand_env_vars(env)
-        
-        server_params = StdioServerParameters(
-            command=command,
-            args=args,
-            env=env
-        )
-        
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, arguments=arguments)
-                return result
-    
-    async def _call_tool_sse(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """通过 SSE 调用工具"""
-        url = self.config.get("url") or self.config.get("baseUrl")
-        if not url:
-            raise ValueError("SSE transport requires 'url' or 'baseUrl'")
-        
-        headers = self.config.get("headers", {})
-        headers = self._expand_env_vars(headers)
-        
-        async with sse_client(url, headers=headers) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, arguments=arguments)
-                return result
-    
-    async def _call_tool_http(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """通过 Streamable HTTP 调用工具"""
-        url = self.config.get("url") or self.config.get("baseUrl")
-        if not url:
-            raise ValueError("HTTP transport requires 'url' or 'baseUrl'")
-        
-        headers = self.config.get("headers", {})
-        headers = self._expand_env_vars(headers)
+        if self._session is not None:
+            return await self._session.call_tool(tool_name, arguments=arguments)
         
-        async with streamablehttp_client(url) as (read, write, _):
-            async with ClientSession(read, write) as session:
+        # 未在 async with 中：新建连接，用完即关
+        async with self._open_transport() as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
                 await session.initialize()
-                result = await session.call_tool(tool_name, arguments=arguments)
-                return result
+                return await session.call_tool(tool_name, arguments=arguments)
     
     def __repr__(self) -> str:
         return f"MCPClient(transport={self.transport_type})"
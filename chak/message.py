@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Literal, Optional, List, Union, Dict, Any
+from typing import Literal, Optional, List, Union, Dict, Any, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 
 class Function(BaseModel):
@@ -22,13 +22,25 @@ class ChatCompletionMessageToolCall(BaseModel):
 # ===== Base Message =====
 class BaseMessage(BaseModel):
     """所有消息的基类"""
-    content: Optional[str] = None
+    content: str = ""  # 构造时 None 统一为 ""，下游无需再判空
     reasoning_content: Optional[str] = None
     tool_calls: Optional[List[ChatCompletionMessageToolCall]] = None
     refusal: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)  # 元数据（provider、model、usage等）
     timestamp: datetime = Field(default_factory=datetime.now)  # 消息创建时间
 
+    @field_validator("content", mode="before")
+    @classmethod
+    def _normalize_content(cls, v: Any) -> Any:
+        return "" if v is None else v
+
+    # Token 计数缓存：(token_counter, content, count)，仅当 counter 与 content 均未变化时有效
+    _token_cache: Optional[Tuple[Any, str, int]] = PrivateAttr(default=None)
+    # strip() 结果缓存：(content, stripped)，content 未变化时有效
+    _strip_cache: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+    # 摘要 prompt 中的压缩文本缓存：(content, compacted)，content 未变化时有效
+    _compact_cache: Optional[Tuple[str, str]] = PrivateAttr(default=None)
+
 
 # ===== Real Conversation Messages =====
 class HumanMessage(BaseMessage):
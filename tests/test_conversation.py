@@ -0,0 +1,76 @@
+"""Tests for Conversation message extraction with a fake provider."""
+
+from chak import conversation as conversation_module
+from chak.conversation import Conversation
+from chak.message import AIMessage, HumanMessage, SystemMessage
+
+
+class _RecordingProvider:
+    def __init__(self):
+        self.sent = []
+    
+    def send(self, messages, stream=False, **kwargs):
+        self.sent.append([(m.role, m.content) for m in messages])
+        return AIMessage(content="ok")
+    
+    def close(self):
+        pass
+
+
+def _conversation(monkeypatch, **kwargs):
+    provider = _RecordingProvider()
+    monkeypatch.setattr(conversation_module, "create_provider", lambda *a, **k: provider)
+    return Conversation("openai/gpt-4o-mini", api_key="sk-test", **kwargs), provider
+
+
+def test_replaced_message_is_sent(monkeypatch):
+    conv, provider = _conversation(monkeypatch, system_message="be brief")
+    conv.send("hello")
+    
+    conv.messages[0] = SystemMessage(content="be verbose")
+    conv.send("again")
+    
+    assert provider.sent[-1] == [
+        ("system", "be verbose"),
+        ("user", "hello"),
+        ("assistant", "ok"),
+        ("user", "again"),
+    ]
+
+
+def test_message_replaced_by_system_message_is_reclassified(monkeypatch):
+    conv, provider = _conversation(monkeypatch)
+    conv.send("hello")
+    conv.send("more")
+    
+    conv.messages[0] = SystemMessage(content="be brief")
+    conv.send("again")
+    
+    assert provider.sent[-1] == [
+        ("system", "be brief"),
+        ("assistant", "ok"),
+        ("user", "more"),
+        ("assistant", "ok"),
+        ("user", "again"),
+    ]
+
+
+def test_stats_follow_replaced_messages(monkeypatch):
+    conv, _ = _conversation(monkeypatch)
+    conv.send("hello")
+    conv.send("more")
+    assert conv.stats()["by_type"] == {"user": 2, "assistant": 2}
+    
+    conv.messages[0] = SystemMessage(content="be brief")
+    assert conv.stats()["by_type"] == {"system": 1, "user": 1, "assistant": 2}
+
+
+def test_parsed_model_uri_is_read_only():
+    import pytest
+    
+    parsed = conversation_module._parse_model_uri("openai@https://api.openai.com/v1:gpt-4?temperature=0.7")
+    with pytest.raises(TypeError):
+        parsed["model"] = "other"
+    with pytest.raises(TypeError):
+        parsed["params"]["temperature"] = "1.0"
+    assert conversation_module._parse_model_uri("openai@https://api.openai.com/v1:gpt-4?temperature=0.7") is parsed
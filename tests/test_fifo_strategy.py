@@ -0,0 +1,64 @@
+"""Tests for FIFOStrategy's reuse of its last untruncated result."""
+
+from chak.context.strategies import FIFOStrategy, StrategyRequest
+from chak.message import AIMessage, HumanMessage, SystemMessage
+
+
+def _word_count(text):
+    return len(text.split())
+
+
+def _fifo():
+    return FIFOStrategy(max_input_tokens=100, token_counter=_word_count)
+
+
+def _history():
+    return [
+        SystemMessage(content="be brief"),
+        HumanMessage(content="q " * 10),
+        AIMessage(content="a " * 10),
+    ]
+
+
+def test_append_reuses_running_totals(monkeypatch):
+    strategy = _fifo()
+    messages = _history()
+    first = strategy.process(StrategyRequest(messages=messages))
+    assert first.messages is messages
+    
+    def fail_analyze(messages):
+        raise AssertionError("appended messages should not trigger a full analysis")
+    
+    monkeypatch.setattr(strategy, "_analyze", fail_analyze)
+    
+    messages.append(HumanMessage(content="q " * 10))
+    assert strategy.process(StrategyRequest(messages=messages)).messages is messages
+    
+    new_messages = [AIMessage(content="a " * 10)]
+    result = strategy.process_incremental(first, new_messages)
+    assert result.messages == messages + new_messages
+
+
+def test_edited_earlier_message_is_recounted():
+    strategy = _fifo()
+    messages = _history()
+    strategy.process(StrategyRequest(messages=messages))
+    
+    # Edit (not append): the earlier answer alone now exceeds the budget
+    messages[2] = AIMessage(content="a " * 200)
+    messages.append(HumanMessage(content="q"))
+    result = strategy.process(StrategyRequest(messages=messages))
+    
+    assert [m.role for m in result.messages].count("context") == 1
+    fresh = _fifo().process(StrategyRequest(messages=messages))
+    assert [(m.role, m.content) for m in fresh.messages] == [(m.role, m.content) for m in result.messages]
+    
+    # Assigning content on the same object is detected as well
+    strategy = _fifo()
+    messages = _history()
+    strategy.process(StrategyRequest(messages=messages))
+    messages[1].content = "q " * 200
+    messages.append(AIMessage(content="a"))
+    result = strategy.process(StrategyRequest(messages=messages))
+    
+    assert [m.role for m in result.messages].count("context") == 1
@@ -0,0 +1,45 @@
+"""Tests for LRUStrategy's reuse of its last response."""
+
+from chak.context.strategies import LRUStrategy, StrategyRequest, StrategyResponse
+from chak.message import AIMessage, HumanMessage
+
+
+def _lru(monkeypatch):
+    strategy = LRUStrategy(
+        max_input_tokens=200,
+        token_counter=lambda text: len(text.split()),
+        summarizer_model_uri="openai/gpt-4o-mini",
+        summarizer_api_key="sk-test",
+    )
+    calls = []
+    
+    def copying_process(request):
+        # Stand-in for a summarizer that returns a new list (as when it inserts a marker)
+        calls.append(request)
+        return StrategyResponse(messages=list(request.messages))
+    
+    monkeypatch.setattr(strategy._summarization_strategy, "process", copying_process)
+    return strategy, calls
+
+
+def test_unchanged_input_reuses_response(monkeypatch):
+    strategy, calls = _lru(monkeypatch)
+    messages = [HumanMessage(content="hi"), AIMessage(content="hello")]
+    
+    first = strategy.process(StrategyRequest(messages=messages))
+    assert strategy.process(StrategyRequest(messages=messages)) is first
+    assert len(calls) == 1
+
+
+def test_edited_input_is_reprocessed(monkeypatch):
+    strategy, calls = _lru(monkeypatch)
+    messages = [HumanMessage(content="hi"), AIMessage(content="hello")]
+    strategy.process(StrategyRequest(messages=messages))
+    
+    messages[0] = HumanMessage(content="hi again")
+    result = strategy.process(StrategyRequest(messages=messages))
+    assert result.messages[0] is messages[0]
+    
+    messages[1].content = "hello again"
+    strategy.process(StrategyRequest(messages=messages))
+    assert len(calls) == 3
@@ -0,0 +1,51 @@
+"""Tests for Conversation._coalesce_chunks with provider-converted chunks."""
+
+from types import SimpleNamespace
+
+from chak.conversation import Conversation
+from chak.providers.llm.base import OpenAICompatibleMessageConverter
+
+
+def _provider_chunk(content, finish_reason=None):
+    """Build an OpenAI-style streaming chunk."""
+    delta = SimpleNamespace(content=content)
+    choice = SimpleNamespace(delta=delta, finish_reason=finish_reason)
+    return SimpleNamespace(choices=[choice], model="gpt-test")
+
+
+def _converted(contents):
+    converter = OpenAICompatibleMessageConverter()
+    raw = [_provider_chunk(c) for c in contents] + [_provider_chunk("", finish_reason="stop")]
+    return [converter.from_provider_chunk(c) for c in raw]
+
+
+def test_converter_chunks_carry_metadata():
+    chunks = _converted(["a"])
+    assert chunks[0].metadata
+
+
+def test_coalesce_merges_provider_chunks():
+    chunks = _converted(["ab", "cd", "ef", "g"])
+    out = list(Conversation._coalesce_chunks(iter(chunks), 3))
+    
+    assert [c.content for c in out] == ["abcd", "efg", ""]
+    assert [c.is_final for c in out] == [False, False, True]
+    # Merged chunks keep the metadata of their last input chunk
+    assert out[0].metadata == chunks[1].metadata
+    assert out[1].metadata == chunks[3].metadata
+
+
+def test_coalesce_preserves_content():
+    contents = ["x" * n for n in (1, 2, 3, 5, 8, 13)]
+    chunks = _converted(contents)
+    out = list(Conversation._coalesce_chunks(iter(chunks), 7))
+    
+    assert "".join(c.content for c in out) == "".join(contents)
+    assert out[-1].is_final
+    assert all(len(c.content) >= 7 for c in out[:-2])
+
+
+def test_coalesce_disabled_passes_through():
+    chunks = _converted(["ab", "cd"])
+    out = list(Conversation._coalesce_chunks(iter(chunks), 0))
+    assert out == chunks
@@ -0,0 +1,225 @@
+"""Tests for SummarizationStrategy that need no summarizer model."""
+
+import random
+
+from chak.context.strategies import SummarizationStrategy, StrategyRequest
+from chak.message import AIMessage, HumanMessage, SystemMessage
+
+
+def _word_count(text):
+    return len(text.split())
+
+
+def _sliding(**kwargs):
+    return SummarizationStrategy(
+        max_input_tokens=200,
+        summarize_threshold=0.5,
+        prefer_recent_turns=2,
+        token_counter=_word_count,
+        mode="sliding",
+        **kwargs
+    )
+
+
+def _shape(messages):
+    """Comparable view of a message list (markers are new objects on every run)."""
+    return [(m.role, m.content, m.metadata.get("type")) for m in messages]
+
+
+def test_sliding_state_matches_fresh_instance():
+    rng = random.Random(0)
+    for _ in range(20):
+        stateful = _sliding()
+        messages = [SystemMessage(content="be brief")]
+        for turn in range(40):
+            messages.append(HumanMessage(content="q " * rng.randint(1, 30)))
+            messages.append(AIMessage(content="a " * rng.randint(1, 30)))
+            
+            fresh_result = _sliding().process(StrategyRequest(messages=list(messages)))
+            messages = stateful.process(StrategyRequest(messages=messages)).messages
+            
+            assert _shape(messages) == _shape(fresh_result.messages), turn
+
+
+def test_cooldown_never_exceeds_input_limit():
+    strategy = _sliding(min_summarize_interval=1000, retrigger_margin=10.0)
+    messages = [SystemMessage(content="be brief")]
+    for _ in range(60):
+        messages.append(HumanMessage(content="q " * 15))
+        messages.append(AIMessage(content="a " * 15))
+        messages = strategy.process(StrategyRequest(messages=messages)).messages
+        
+        # Tokens the conversation would send: system + last marker onwards
+        last_marker = max(
+            (i for i, m in enumerate(messages) if m.role == "context"), default=None
+        )
+        window = messages[last_marker:] if last_marker is not None else messages[1:]
+        sent = strategy.count_messages_tokens([messages[0]] + window)
+        assert sent <= strategy.max_input_tokens
+
+
+class _FakeProvider:
+    def __init__(self):
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+def _summarizer():
+    return SummarizationStrategy(
+        max_input_tokens=200,
+        token_counter=_word_count,
+        summarizer_model_uri="openai/gpt-4o-mini",
+        summarizer_api_key="sk-test",
+    )
+
+
+def test_shared_provider_closed_by_last_strategy(monkeypatch):
+    from chak.context.strategies import summarize
+    
+    created = []
+    
+    def fake_create_provider(*args, **kwargs):
+        created.append(_FakeProvider())
+        return created[-1]
+    
+    monkeypatch.setattr(summarize, "create_provider", fake_create_provider)
+    
+    first, second = _summarizer(), _summarizer()
+    assert first._get_provider() is second._get_provider()
+    assert len(created) == 1
+    
+    first.close()
+    assert not created[0].closed
+    second.close()
+    assert created[0].closed
+    assert not summarize._shared_providers
+    
+    # A later strategy with the same config gets a fresh provider
+    third = _summarizer()
+    assert third._get_provider() is created[-1] and len(created) == 2
+    third.close()
+
+
+def test_edited_earlier_message_is_recounted():
+    strategy = _sliding()
+    messages = [SystemMessage(content="be brief")]
+    for _ in range(3):
+        messages.append(HumanMessage(content="q " * 10))
+        messages.append(AIMessage(content="a " * 10))
+    assert strategy.process(StrategyRequest(messages=messages)).messages is messages
+    
+    # Edit (not append): the earlier answer now pushes the total over the threshold
+    messages[2].content = "a " * 150
+    messages.append(HumanMessage(content="q"))
+    result = strategy.process(StrategyRequest(messages=messages))
+    
+    fresh = _sliding().process(StrategyRequest(messages=list(messages)))
+    assert _shape(result.messages) == _shape(fresh.messages)
+    assert any(m.role == "context" for m in result.messages)
+
+
+def test_min_savings_never_exceeds_input_limit():
+    strategy = _sliding(min_savings_tokens=1000)
+    messages = [SystemMessage(content="be brief")]
+    for _ in range(3):
+        messages.append(HumanMessage(content="q " * 5))
+        messages.append(AIMessage(content="a " * 5))
+    # The latest turns alone are over the limit; the older span saves little
+    messages.append(HumanMessage(content="q " * 150))
+    messages.append(AIMessage(content="a " * 150))
+    
+    result = strategy.process(StrategyRequest(messages=messages))
+    assert any(m.role == "context" for m in result.messages)
+
+
+def test_dropped_strategy_releases_shared_provider(monkeypatch):
+    import gc
+    from chak.context.strategies import summarize
+    
+    created = []
+    
+    def fake_create_provider(*args, **kwargs):
+        created.append(_FakeProvider())
+        return created[-1]
+    
+    monkeypatch.setattr(summarize, "create_provider", fake_create_provider)
+    
+    first, second, dropped = _summarizer(), _summarizer(), _summarizer()
+    first._get_provider()
+    second._get_provider()
+    dropped._get_provider()
+    
+    del dropped
+    gc.collect()
+    assert not created[0].closed
+    
+    # close() followed by collection releases only once
+    first.close()
+    del first
+    gc.collect()
+    assert not created[0].closed
+    
+    second.close()
+    assert created[0].closed
+    assert not summarize._shared_providers
+
+
+class _SummarizerProvider(_FakeProvider):
+    """Fake summarizer that answers once `release` is set."""
+    
+    def __init__(self):
+        super().__init__()
+        import threading
+        self.release = threading.Event()
+    
+    def send(self, messages, stream=False, **kwargs):
+        assert not stream
+        self.release.wait(5)
+        return AIMessage(content="earlier turns summarized")
+
+
+def test_background_summary_lands_before_preserved_messages(monkeypatch):
+    from chak.context.strategies import summarize
+    
+    provider = _SummarizerProvider()
+    monkeypatch.setattr(summarize, "create_provider", lambda *args, **kwargs: provider)
+    
+    strategy = SummarizationStrategy(
+        max_input_tokens=200,
+        summarize_threshold=0.5,
+        prefer_recent_turns=2,
+        token_counter=_word_count,
+        summarizer_model_uri="openai/gpt-4o-mini",
+        summarizer_api_key="sk-test",
+        background_summarize=True,
+    )
+    messages = [SystemMessage(content="be brief")]
+    for _ in range(6):
+        messages.append(HumanMessage(content="q " * 10))
+        messages.append(AIMessage(content="a " * 10))
+    
+    # Triggering call: the summary is submitted and this turn goes out unchanged
+    assert strategy.process(StrategyRequest(messages=messages)).messages is messages
+    future, _, boundary, summarized_count = strategy._pending_summary
+    summarized = messages[:messages.index(boundary)]
+    assert summarized_count == len(summarized)
+    
+    # More turns arrive while the summarizer is still running
+    messages.append(HumanMessage(content="next"))
+    messages.append(AIMessage(content="reply"))
+    provider.release.set()
+    future.result(timeout=5)
+    
+    result = strategy.process(StrategyRequest(messages=messages)).messages
+    marker_idx = next(i for i, m in enumerate(result) if m.role == "context")
+    marker = result[marker_idx]
+    assert marker.metadata["summary"] == "earlier turns summarized"
+    assert marker.metadata["summarized_count"] == len(summarized)
+    assert result[:marker_idx] == summarized
+    assert result[marker_idx + 1] is boundary
+    assert result[marker_idx + 1:] == messages[len(summarized):]
+    
+    strategy.close()
+    assert provider.closed